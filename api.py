@@ -0,0 +1,259 @@
+# ============================================
+# 🌐 Servicio API local — motor de desviación con caché caliente
+# Mantiene en memoria la tabla de tiempos y los inventarios ya procesados (por hash de
+# contenido), así que consultar no vuelve a procesar el archivo.
+#
+#   python api.py --host 127.0.0.1 --puerto 8765
+#
+#   POST /inventarios[?deduplicar=1]          cuerpo = .xlsx  → {"id": ...}
+#   GET  /inventarios                         inventarios en caché
+#   GET  /inventarios/<id>/resumenes          todos los resúmenes (o ?nombre=estado)
+#   GET  /inventarios/<id>/procesos           ?deudor=&operacion=&nivel=&pagina=&tamano=&formato=json|arrow|parquet
+#   GET  /inventarios/<id>/proximos           ?pagina=&tamano=&formato=json|arrow|parquet
+# ============================================
+
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from duplicados import llave_texto
+from exportar import MIME_ARROW_FLUJO, MIME_PARQUET, arrow_bytes, parquet_bytes
+from motor import COL_SUB_TIEMPOS, TIEMPOS_PATH, leer_excel_normalizado, procesar_inventario
+from precalculo import cargar_precalculado, clave_dataset, hash_contenido
+from resumenes import calcular_proximos, resumenes_del_dia, resumenes_fijos
+from subetapas import cargar_alias, construir_indice, firma_alias
+
+MAX_INVENTARIOS = 8
+TAMANO_PAGINA, TAMANO_MAXIMO = 100, 5000
+COLUMNAS_PROCESO = [
+    "DEUDOR", "OPERACION", "ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA", "CAPITAL_ACT",
+    "DIAS_POR_ETAPA", "VAR_FECHA_CALCULADA", "PORC_DESVIACION", "NIVEL_DESVIACION",
+    "ESTADO_TIEMPO", "PORC_AVANCE", "CIUDAD", "JUZGADO",
+]
+COLUMNAS_PROXIMO = COLUMNAS_PROCESO + ["DIAS_RESTANTES", "FECHA_LIMITE"]
+
+
+# ============================================
+# 🗃️ Caché de inventarios procesados
+# ============================================
+class CacheInventarios:
+    """
+    LRU de inventarios procesados; cada entrada guarda resúmenes e índices de consulta.
+    Lo que depende de la fecha (Próximos a Vencer) se recalcula cuando cambia el día (del_dia).
+    """
+
+    def __init__(self, max_inventarios: int = MAX_INVENTARIOS, tiempos_path: str = TIEMPOS_PATH):
+        self.tiempos = leer_excel_normalizado(tiempos_path)
+        self.indice = construir_indice(self.tiempos[COL_SUB_TIEMPOS])
+        self.max_inventarios = max_inventarios
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cargar(self, contenido: bytes, deduplicar: bool = False) -> dict:
+        clave = clave_dataset(hash_contenido(contenido), deduplicar)
+        firma = firma_alias()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada["firma"] == firma:
+                self._entradas.move_to_end(clave)
+                return entrada
+
+        entrada = self._procesar(clave, firma, contenido, deduplicar)
+        with self._lock:
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_inventarios:
+                self._entradas.popitem(last=False)
+        return entrada
+
+    def _procesar(self, clave: str, firma: str, contenido: bytes, deduplicar: bool) -> dict:
+        # Si el vigilante ya lo dejó en disco (precalculo.py), no se procesa de nuevo
+        precalculado = cargar_precalculado(clave, firma)
+        if precalculado is not None:
+            errores, df_all, resumenes = precalculado["errores"], precalculado["df_all"], precalculado["resumenes"]
+        else:
+            inv = leer_excel_normalizado(BytesIO(contenido))
+            inv, errores, df_all = procesar_inventario(inv, self.tiempos, cargar_alias(), self.indice, deduplicar)
+            resumenes = resumenes_fijos(df_all)
+        df_all = df_all.reset_index(drop=True)
+        return {
+            "id": clave, "firma": firma, "cargado": datetime.now().isoformat(timespec="seconds"),
+            "df_all": df_all, "errores": len(errores),
+            "resumenes": resumenes,
+            # valor (texto) → posiciones en df_all; la consulta es un dict lookup
+            "por_deudor": _indice_posiciones(df_all, "DEUDOR"),
+            "por_operacion": _indice_posiciones(df_all, "OPERACION"),
+        }
+
+    def del_dia(self, entrada: dict) -> dict:
+        """Próximos a vencer y resúmenes completos de hoy; se recalculan al cambiar la fecha."""
+        hoy = datetime.now()
+        dia = entrada.get("dia")
+        if dia is None or dia["fecha"] != hoy.date():
+            _, proximos = calcular_proximos(entrada["df_all"], hoy)
+            dia = {
+                "fecha": hoy.date(),
+                "proximos": proximos.reset_index(drop=True) if proximos is not None else None,
+                "resumenes": {**entrada["resumenes"], **resumenes_del_dia(proximos)},
+            }
+            entrada["dia"] = dia  # reemplazo atómico: dos hilos a lo sumo calculan lo mismo
+        return dia
+
+    def obtener(self, clave: str) -> dict | None:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+            return entrada
+
+    def listar(self) -> list:
+        with self._lock:
+            return [
+                {"id": e["id"], "procesos": len(e["df_all"]), "errores": e["errores"], "cargado": e["cargado"]}
+                for e in self._entradas.values()
+            ]
+
+
+def _indice_posiciones(df: pd.DataFrame, col: str) -> dict:
+    if col not in df.columns:
+        return {}
+    return df.groupby(llave_texto(df[col]), sort=False).indices
+
+
+# ============================================
+# 📦 Serialización
+# ============================================
+def _pagina(df: pd.DataFrame, consulta: dict) -> tuple:
+    tamano = min(max(int(consulta.get("tamano", TAMANO_PAGINA)), 1), TAMANO_MAXIMO)
+    pagina = max(int(consulta.get("pagina", 1)), 1)
+    total = len(df)
+    inicio = (pagina - 1) * tamano
+    meta = {"total": total, "pagina": pagina, "tamano": tamano, "paginas": -(-total // tamano)}
+    return df.iloc[inicio:inicio + tamano], meta
+
+
+def _a_json(df: pd.DataFrame) -> list:
+    return json.loads(df.to_json(orient="records", date_format="iso", force_ascii=False))
+
+
+# ============================================
+# 🌐 Manejador HTTP
+# ============================================
+class ManejadorAPI(BaseHTTPRequestHandler):
+    cache: CacheInventarios = None  # se asigna en servir()
+
+    def _responder(self, estado: int, cuerpo: bytes, tipo: str, extra: dict | None = None):
+        self.send_response(estado)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        for k, v in (extra or {}).items():
+            self.send_header(k, str(v))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _json(self, estado: int, datos):
+        self._responder(estado, json.dumps(datos, ensure_ascii=False, default=str).encode("utf-8"),
+                        "application/json; charset=utf-8")
+
+    def _tabla(self, df: pd.DataFrame, consulta: dict, columnas: list):
+        df = df[[c for c in columnas if c in df.columns]]
+        pagina, meta = _pagina(df, consulta)
+        cabeceras = {f"X-{k.capitalize()}": v for k, v in meta.items()}
+        if consulta.get("formato") == "arrow":
+            self._responder(200, arrow_bytes(pagina, flujo=True), MIME_ARROW_FLUJO, cabeceras)
+        elif consulta.get("formato") == "parquet":
+            self._responder(200, parquet_bytes(pagina), MIME_PARQUET, cabeceras)
+        else:
+            self._json(200, {**meta, "datos": _a_json(pagina)})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/inventarios":
+            return self._json(404, {"error": "Ruta no encontrada"})
+        largo = int(self.headers.get("Content-Length", 0))
+        if largo <= 0:
+            return self._json(400, {"error": "Envía el inventario (.xlsx) en el cuerpo de la petición"})
+        try:
+            deduplicar = parse_qs(url.query).get("deduplicar", ["0"])[-1] in ("1", "true", "si")
+            entrada = self.cache.cargar(self.rfile.read(largo), deduplicar)
+        except Exception as e:  # archivo ilegible o sin columnas mínimas
+            return self._json(400, {"error": f"No se pudo procesar el inventario: {e}"})
+        self._json(201, {
+            "id": entrada["id"], "procesos": len(entrada["df_all"]), "errores": entrada["errores"],
+            "resumenes": list(self.cache.del_dia(entrada)["resumenes"]),
+        })
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if partes == ["inventarios"]:
+            return self._json(200, self.cache.listar())
+        if len(partes) != 3 or partes[0] != "inventarios":
+            return self._json(404, {"error": "Ruta no encontrada"})
+
+        entrada = self.cache.obtener(partes[1])
+        if entrada is None:
+            return self._json(404, {"error": "Inventario no cargado; súbelo con POST /inventarios"})
+
+        try:
+            if partes[2] == "resumenes":
+                resumenes = self.cache.del_dia(entrada)["resumenes"]
+                if "nombre" in consulta:
+                    if consulta["nombre"] not in resumenes:
+                        return self._json(404, {"error": f"Resumen desconocido: {consulta['nombre']}"})
+                    resumenes = {consulta["nombre"]: resumenes[consulta["nombre"]]}
+                return self._json(200, {k: _a_json(v) for k, v in resumenes.items()})
+
+            if partes[2] == "procesos":
+                df = entrada["df_all"]
+                posiciones = None
+                for param, indice in (("deudor", "por_deudor"), ("operacion", "por_operacion")):
+                    if param in consulta:
+                        pos = entrada[indice].get(consulta[param].strip(), np.array([], dtype=np.intp))
+                        posiciones = pos if posiciones is None else np.intersect1d(posiciones, pos)
+                if posiciones is not None:
+                    df = df.iloc[np.sort(posiciones)]
+                if "nivel" in consulta:
+                    df = df[df["NIVEL_DESVIACION"] == consulta["nivel"].upper()]
+                return self._tabla(df, consulta, COLUMNAS_PROCESO)
+
+            if partes[2] == "proximos":
+                proximos = self.cache.del_dia(entrada)["proximos"]
+                if proximos is None:
+                    return self._json(409, {"error": "El inventario no tiene las columnas para Próximos a Vencer"})
+                return self._tabla(proximos, consulta, COLUMNAS_PROXIMO)
+        except ValueError as e:  # pagina/tamano no numéricos
+            return self._json(400, {"error": str(e)})
+
+        self._json(404, {"error": "Ruta no encontrada"})
+
+
+def servir(host: str = "127.0.0.1", puerto: int = 8765, max_inventarios: int = MAX_INVENTARIOS):
+    ManejadorAPI.cache = CacheInventarios(max_inventarios)
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorAPI)
+    print(f"🌐 API de desviación procesal en http://{host}:{puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API local del motor de desviación procesal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--max-inventarios", type=int, default=MAX_INVENTARIOS)
+    args = parser.parse_args()
+    servir(args.host, args.puerto, args.max_inventarios)
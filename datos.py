@@ -0,0 +1,141 @@
+# ============================================
+# 🗃️ Dataset compartido entre páginas
+# Procesa el inventario una sola vez por contenido (hash) y lo reutiliza
+# ============================================
+
+import hashlib
+from datetime import date
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from motor import COL_SUB_TIEMPOS, TIEMPOS_PATH, leer_excel_normalizado, procesar_inventario
+from perfil import SECCIONES_PERFIL, perfil_estadistico
+from precalculo import ARCHIVOS_DEL_DIA, SECCIONES_ARCHIVO, cargar_precalculado, clave_dataset, generar_archivo, leer_archivo
+from resumenes import SECCION_DEL_DIA, SECCIONES_FIJAS, calcular_proximos, resumenes_del_dia, resumenes_fijos
+from subetapas import cargar_alias, construir_indice, firma_alias
+
+CLAVE_UPLOADER = "inventario_file"
+CLAVE_DEDUP = "deduplicar_operaciones"
+
+
+@st.cache_data(show_spinner=False)
+def cargar_tiempos(path: str = TIEMPOS_PATH) -> pd.DataFrame:
+    return leer_excel_normalizado(path)
+
+
+@st.cache_resource(show_spinner=False)
+def indice_subetapas() -> dict:
+    """Índice de tokens de la tabla de tiempos; se comparte para que su memo sobreviva reruns."""
+    return construir_indice(cargar_tiempos()[COL_SUB_TIEMPOS])
+
+
+@st.cache_resource(show_spinner="⏳ Procesando inventario...", max_entries=4)
+def _procesar(clave: str, firma: str, deduplicar: bool, _contenido: bytes) -> dict:
+    """
+    Cacheado por hash de contenido y firma del archivo de alias; `_contenido` no se hashea de nuevo.
+    Si el vigilante ya lo precalculó (precalculo.py), solo se leen los resultados.
+    Es cache_resource: todas las páginas reciben los mismos objetos, no deben mutarlos.
+    """
+    base = {"clave": clave, "firma": firma, "deduplicar": deduplicar}
+    precalculado = cargar_precalculado(clave_dataset(clave, deduplicar), firma)
+    if precalculado is not None:
+        return {**base, **precalculado}
+
+    inv = leer_excel_normalizado(BytesIO(_contenido))
+    inv, errores, df_all = procesar_inventario(
+        inv, cargar_tiempos(), cargar_alias(), indice_subetapas(), deduplicar=deduplicar
+    )
+    return {**base, "inventario": inv, "errores": errores, "df_all": df_all, "resumenes": None, "ruta": None}
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _seccion(clave: str, firma: str, deduplicar: bool, seccion: str, _df_all: pd.DataFrame) -> dict:
+    return resumenes_fijos(_df_all, [seccion])
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _resumenes_del_dia(clave: str, firma: str, deduplicar: bool, fecha: str, _df_all: pd.DataFrame) -> dict:
+    _, proximos = calcular_proximos(_df_all)
+    return resumenes_del_dia(proximos)
+
+
+def obtener_resumenes(dataset: dict, *secciones: str) -> dict:
+    """
+    Resúmenes de las `secciones` pedidas (SECCIONES_FIJAS y SECCION_DEL_DIA; sin argumentos, todas).
+    Los fijos vienen del precálculo o se calculan una vez por dataset y sección, al primer uso;
+    los del día (Próximos a Vencer), una vez por dataset y fecha.
+    """
+    clave = (dataset["clave"], dataset["firma"], dataset["deduplicar"])
+    secciones = secciones or (*SECCIONES_FIJAS, SECCION_DEL_DIA)
+    if dataset["resumenes"] is not None:
+        resumenes = dict(dataset["resumenes"])
+    else:
+        resumenes = {}
+        for seccion in secciones:
+            if seccion in SECCIONES_FIJAS:
+                resumenes.update(_seccion(*clave, seccion, dataset["df_all"]))
+    if SECCION_DEL_DIA in secciones:
+        resumenes.update(_resumenes_del_dia(*clave, date.today().isoformat(), dataset["df_all"]))
+    return resumenes
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _perfil(clave: str, firma: str, deduplicar: bool, fecha: str,
+            _df_all: pd.DataFrame, _resumenes: dict) -> dict:
+    return perfil_estadistico(_df_all, _resumenes)
+
+
+def obtener_perfil(dataset: dict) -> dict:
+    """Perfil estadístico acotado (perfil.py) para los prompts de CHRIS IA, una vez por dataset y fecha."""
+    return _perfil(dataset["clave"], dataset["firma"], dataset["deduplicar"], date.today().isoformat(),
+                   dataset["df_all"], obtener_resumenes(dataset, *SECCIONES_PERFIL))
+
+
+@st.cache_data(show_spinner="⏳ Generando archivo de descarga...", max_entries=16)
+def _generar_archivo(clave: str, firma: str, deduplicar: bool, nombre: str, fecha: str,
+                     _errores: pd.DataFrame, _df_all: pd.DataFrame, _resumenes: dict) -> bytes:
+    return generar_archivo(nombre, _errores, _df_all, _resumenes)
+
+
+def archivo_descarga(dataset: dict, nombre: str) -> bytes:
+    """
+    Archivo de precalculo.ARCHIVOS: el del vigilante si existe, si no se genera una vez.
+    Los ARCHIVOS_DEL_DIA siempre se generan, una vez por fecha.
+    """
+    del_dia = nombre in ARCHIVOS_DEL_DIA
+    contenido = None if del_dia else leer_archivo(dataset["ruta"], nombre)
+    if contenido is not None:
+        return contenido
+    # Solo se calculan los resúmenes que el archivo usa (ninguno, algunos o todos)
+    secciones = SECCIONES_ARCHIVO.get(nombre, ())
+    resumenes = obtener_resumenes(dataset, *secciones) if secciones else {}
+    return _generar_archivo(
+        dataset["clave"], dataset["firma"], dataset["deduplicar"], nombre,
+        date.today().isoformat() if del_dia else "",
+        dataset["errores"], dataset["df_all"], resumenes,
+    )
+
+
+def obtener_dataset() -> dict:
+    """Dataset del inventario subido en la barra lateral; detiene la página si no hay archivo."""
+    archivo = st.session_state.get(CLAVE_UPLOADER)
+    if not archivo:
+        st.info("📥 Sube el inventario (.xlsx) en la barra lateral para iniciar.")
+        st.stop()
+
+    # El hash se calcula una vez por archivo subido, no en cada rerun
+    hashes = st.session_state.setdefault("_hash_inventario", {})
+    if archivo.file_id not in hashes:
+        hashes[archivo.file_id] = hashlib.sha256(archivo.getvalue()).hexdigest()
+    clave = hashes[archivo.file_id]
+
+    try:
+        dataset = _procesar(clave, firma_alias(), st.session_state.get(CLAVE_DEDUP, False), archivo.getvalue())
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    st.session_state["base_limpia"] = dataset["df_all"]
+    return dataset
+
@@ -0,0 +1,89 @@
+# ============================================
+# 🧬 Índice de duplicados y consistencia OPERACION / DEUDOR
+# Se construye una vez al cargar: hashes de 64 bits por fila y por llave, y conteos por
+# tabla hash (groupby / duplicated), todo O(n). Evita contar dos veces CAPITAL_ACT.
+# ============================================
+
+import numpy as np
+import pandas as pd
+
+COL_OPERACION, COL_DEUDOR = "OPERACION", "DEUDOR"
+COLUMNAS_CONTENIDO = ["ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA", "CAPITAL_ACT"]
+COL_DUP_EXACTO = "DUP_EXACTO"            # fila idéntica a otra
+COL_DUP_CONFLICTO = "DUP_CONFLICTO"      # misma OPERACION con etapa/subetapa/capital distintos
+COL_VARIOS_DEUDORES = "OP_VARIOS_DEUDORES"  # misma OPERACION asociada a más de un DEUDOR
+COLUMNAS_INDICE = [COL_DUP_EXACTO, COL_DUP_CONFLICTO, COL_VARIOS_DEUDORES]
+
+
+def llave_texto(serie: pd.Series) -> pd.Series:
+    """
+    Llave de texto sin espacios (1001 y "1001 " son la misma operación). Una columna leída
+    como float por tener celdas vacías vuelve a entero: 1001.0 → "1001".
+    """
+    if pd.api.types.is_float_dtype(serie) and (serie.dropna() % 1 == 0).all():
+        serie = serie.astype("Int64")
+    return serie.astype("string").str.strip()
+
+
+def _hash_filas(df: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(df.astype("string"), index=False).to_numpy()
+
+
+def marcar_duplicados(inv: pd.DataFrame) -> pd.DataFrame:
+    """Agrega COLUMNAS_INDICE (booleanas) a `inv`. Sin columna OPERACION quedan en False."""
+    for col in COLUMNAS_INDICE:
+        inv[col] = False
+    if COL_OPERACION not in inv.columns:
+        return inv
+
+    originales = [c for c in inv.columns if c not in COLUMNAS_INDICE]
+    operacion = llave_texto(inv[COL_OPERACION])
+    con_op = operacion.notna().to_numpy()
+    h_op = pd.util.hash_pandas_object(operacion, index=False).to_numpy()
+
+    h_fila = _hash_filas(inv[originales])
+    inv[COL_DUP_EXACTO] = con_op & pd.Series(h_fila).duplicated(keep=False).to_numpy()
+
+    contenido = [c for c in COLUMNAS_CONTENIDO if c in inv.columns]
+    if contenido:
+        h_contenido = pd.Series(_hash_filas(inv[contenido]))
+        distintos = h_contenido.groupby(h_op).transform("nunique").to_numpy()
+        inv[COL_DUP_CONFLICTO] = con_op & (distintos > 1)
+
+    if COL_DEUDOR in inv.columns:
+        deudor = llave_texto(inv[COL_DEUDOR])
+        h_deudor = pd.Series(pd.util.hash_pandas_object(deudor, index=False).to_numpy())
+        deudores = h_deudor[deudor.notna().to_numpy()].groupby(h_op[deudor.notna().to_numpy()]).nunique()
+        inv[COL_VARIOS_DEUDORES] = con_op & (pd.Series(h_op).map(deudores).fillna(0).to_numpy() > 1)
+    return inv
+
+
+def resumen_duplicados(inv: pd.DataFrame) -> pd.DataFrame:
+    """Filas y operaciones afectadas por cada bandera del índice."""
+    operacion = llave_texto(inv[COL_OPERACION]) if COL_OPERACION in inv.columns else None
+    filas = []
+    for col, nombre in ((COL_DUP_EXACTO, "DUPLICADO EXACTO"), (COL_DUP_CONFLICTO, "DUPLICADO EN CONFLICTO"),
+                        (COL_VARIOS_DEUDORES, "OPERACION CON VARIOS DEUDORES")):
+        marcadas = inv[col] if col in inv.columns else pd.Series(False, index=inv.index)
+        filas.append({
+            "ANOMALIA": nombre, "REGISTROS": int(marcadas.sum()),
+            "OPERACIONES": int(operacion[marcadas].nunique()) if operacion is not None else 0,
+        })
+    return pd.DataFrame(filas)
+
+
+def deduplicar_operaciones(df: pd.DataFrame, fecha: str = "FECHA_ACT_ETAPA") -> pd.DataFrame:
+    """
+    Política de deduplicación: una fila por OPERACION, la de FECHA_ACT_ETAPA más reciente
+    (en empate, la última del archivo). Filas sin OPERACION se conservan.
+    """
+    if COL_OPERACION not in df.columns or df.empty:
+        return df
+    operacion = llave_texto(df[COL_OPERACION])
+    if fecha in df.columns:
+        fechas = pd.to_datetime(df[fecha], errors="coerce").fillna(pd.Timestamp.min)  # sin fecha = más antigua
+        orden = np.argsort(fechas.to_numpy(), kind="stable")
+    else:
+        orden = np.arange(len(df))
+    ultima = ~operacion.iloc[orden].duplicated(keep="last").to_numpy() | operacion.iloc[orden].isna().to_numpy()
+    return df.iloc[np.sort(orden[ultima])]
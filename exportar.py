@@ -0,0 +1,105 @@
+# ============================================
+# 📦 Exportación columnar (Parquet / Arrow IPC)
+# Se escribe directo desde el DataFrame en memoria con pyarrow: conserva dtypes
+# (fechas, enteros, categóricos) y evita pasar cada celda por openpyxl.
+# ============================================
+
+import os
+import tempfile
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+
+COMPRESION_PARQUET = "zstd"
+PARTICIONES_INVENTARIO = ["ETAPA_JURIDICA", "MES_INVENTARIO"]
+MIME_PARQUET = "application/vnd.apache.parquet"
+MIME_ARROW_ARCHIVO = "application/vnd.apache.arrow.file"
+MIME_ARROW_FLUJO = "application/vnd.apache.arrow.stream"
+MIME_ZIP = "application/zip"
+
+
+def tabla_arrow(df: pd.DataFrame):
+    """
+    pa.Table sin índice. Si una columna object mezcla tipos (texto y números desde Excel),
+    solo esa columna pasa a texto; el resto conserva su tipo.
+    """
+    import pyarrow as pa
+
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    mixtas = {}
+    for c in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[c], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            mixtas[c] = "string"
+    return pa.Table.from_pandas(df.astype(mixtas), preserve_index=False)
+
+
+def parquet_bytes(df: pd.DataFrame) -> bytes:
+    import pyarrow.parquet as pq
+
+    salida = BytesIO()
+    pq.write_table(tabla_arrow(df), salida, compression=COMPRESION_PARQUET)
+    return salida.getvalue()
+
+
+def arrow_bytes(df: pd.DataFrame, flujo: bool = False) -> bytes:
+    """Arrow IPC: formato archivo (.arrow / Feather v2) o, con `flujo`, formato stream (HTTP)."""
+    import pyarrow as pa
+
+    tabla = tabla_arrow(df)
+    salida = pa.BufferOutputStream()
+    abrir = pa.ipc.new_stream if flujo else pa.ipc.new_file
+    with abrir(salida, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return salida.getvalue().to_pybytes()
+
+
+def con_mes_inventario(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega MES_INVENTARIO (AAAA-MM de FECHA_ACT_INVENTARIO) para particionar."""
+    df = df.copy()
+    fecha = pd.to_datetime(df.get("FECHA_ACT_INVENTARIO"), errors="coerce")
+    df["MES_INVENTARIO"] = fecha.dt.strftime("%Y-%m") if fecha is not None else None
+    return df
+
+
+def parquet_particionado_zip(df: pd.DataFrame, particiones: list = PARTICIONES_INVENTARIO) -> bytes:
+    """Dataset Parquet estilo Hive (col=valor/…/part-0.parquet) comprimido en un .zip."""
+    import pyarrow.parquet as pq
+
+    if "MES_INVENTARIO" in particiones and "MES_INVENTARIO" not in df.columns:
+        df = con_mes_inventario(df)
+    particiones = [c for c in particiones if c in df.columns]
+
+    salida = BytesIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        pq.write_to_dataset(tabla_arrow(df), tmp, partition_cols=particiones or None,
+                            compression=COMPRESION_PARQUET)
+        with zipfile.ZipFile(salida, "w", zipfile.ZIP_STORED) as zf:  # parquet ya va comprimido
+            for raiz, _, archivos in os.walk(tmp):
+                for nombre in archivos:
+                    ruta = os.path.join(raiz, nombre)
+                    zf.write(ruta, os.path.relpath(ruta, tmp))
+    return salida.getvalue()
+
+
+def resumenes_parquet_zip(resumenes: dict) -> bytes:
+    """Un <nombre>.parquet por resumen de resumenes_globales, en un .zip."""
+    salida = BytesIO()
+    with zipfile.ZipFile(salida, "w", zipfile.ZIP_STORED) as zf:
+        for nombre, df in resumenes.items():
+            zf.writestr(f"{nombre}.parquet", parquet_bytes(df.reset_index(drop=True)))
+    return salida.getvalue()
+
+
+def resumenes_arrow_zip(resumenes: dict) -> bytes:
+    """Un <nombre>.arrow (Arrow IPC, formato archivo) por resumen, en un .zip; cada resumen tiene su esquema."""
+    salida = BytesIO()
+    with zipfile.ZipFile(salida, "w", zipfile.ZIP_DEFLATED) as zf:  # IPC va sin comprimir
+        for nombre, df in resumenes.items():
+            zf.writestr(f"{nombre}.arrow", arrow_bytes(df.reset_index(drop=True)))
+    return salida.getvalue()
@@ -0,0 +1,105 @@
+# ============================================
+# 📈 Gráficos Plotly sobre resúmenes precalculados
+# Nunca reciben filas crudas: solo tablas agregadas, recortadas en servidor
+# ============================================
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from motor import NIVELES_DESVIACION
+
+PLANTILLA = "plotly_dark"
+COLORES_NIVEL = {
+    "A TIEMPO": "#2E7D32", "LEVE": "#9CCC65", "MODERADA": "#FBC02D",
+    "GRAVE": "#C62828", "SIN SLA": "#607D8B",
+}
+
+
+def agrupar_top(resumen: pd.DataFrame, col: str, valor: str, top: int = 20, etiqueta_resto: str = "OTROS") -> pd.DataFrame:
+    """Conserva las `top` categorías con mayor `valor` y suma el resto en una sola fila."""
+    if len(resumen) <= top:
+        return resumen
+    orden = resumen.sort_values(valor, ascending=False)
+    cabeza, cola = orden.iloc[:top], orden.iloc[top:]
+    resto = cola.select_dtypes("number").sum().to_frame().T
+    resto[col] = etiqueta_resto
+    return pd.concat([cabeza, resto], ignore_index=True)
+
+
+def heatmap_etapa_subetapa(resumen: pd.DataFrame, max_subetapas: int = 40) -> go.Figure:
+    """Desviación promedio Etapa × Subetapa a partir del ranking del Paso 6."""
+    subs = (
+        resumen.groupby("SUB_ETAPA_JURIDICA")["PROCESOS"].sum()
+        .nlargest(max_subetapas).index
+    )
+    matriz = (
+        resumen[resumen["SUB_ETAPA_JURIDICA"].isin(subs)]
+        .pivot_table(index="ETAPA_JURIDICA", columns="SUB_ETAPA_JURIDICA",
+                     values="PROM_DESV", aggfunc="mean")
+    )
+    fig = px.imshow(
+        matriz, color_continuous_scale="RdYlGn_r", aspect="auto",
+        labels={"color": "% Desv. prom."}, template=PLANTILLA,
+    )
+    fig.update_layout(height=max(400, 22 * len(matriz)), margin=dict(l=10, r=10, t=30, b=10))
+    return fig
+
+
+def barras_capital_nivel(resumen_nivel: pd.DataFrame) -> go.Figure:
+    """Capital (M) por NIVEL_DESVIACION; `resumen_nivel` indexado o con columna NIVEL_DESVIACION."""
+    datos = resumen_nivel.reset_index() if "NIVEL_DESVIACION" not in resumen_nivel.columns else resumen_nivel
+    fig = px.bar(
+        datos, x="NIVEL_DESVIACION", y="CAPITAL", color="NIVEL_DESVIACION", text_auto=",.1f",
+        category_orders={"NIVEL_DESVIACION": NIVELES_DESVIACION}, color_discrete_map=COLORES_NIVEL,
+        labels={"CAPITAL": "Capital (M)", "NIVEL_DESVIACION": "Nivel"}, template=PLANTILLA,
+    )
+    fig.update_layout(showlegend=False, height=380, margin=dict(l=10, r=10, t=30, b=10))
+    return fig
+
+
+def tendencia_banco(resumen_mensual: pd.DataFrame) -> go.Figure:
+    """Procesos y capital por Año × Mes del Bloque Banco (sin fila TOTAL)."""
+    datos = resumen_mensual[resumen_mensual["AÑO_PASE_JURIDICO"].astype(str) != "TOTAL"].copy()
+    datos["PERIODO"] = (
+        datos["MES_PASE_JURIDICO"].astype(str) + " " + pd.to_numeric(datos["AÑO_PASE_JURIDICO"], errors="coerce")
+        .astype("Int64").astype(str)
+    )
+    fig = go.Figure()
+    fig.add_bar(x=datos["PERIODO"], y=datos["CAPITAL_M"], name="Capital (M)", marker_color="#F57C00")
+    fig.add_scatter(x=datos["PERIODO"], y=datos["PROCESOS"], name="Procesos", yaxis="y2",
+                    mode="lines+markers", line=dict(color="#4FC3F7"))
+    fig.update_layout(
+        template=PLANTILLA, height=400, margin=dict(l=10, r=10, t=30, b=10),
+        yaxis=dict(title="Capital (M)"),
+        yaxis2=dict(title="Procesos", overlaying="y", side="right", showgrid=False),
+        xaxis=dict(type="category"), legend=dict(orientation="h", y=1.1),
+    )
+    return fig
+
+
+def distribucion_juzgados(resumen_juzgado: pd.DataFrame, col_ciudad: str, col_juzgado: str, top: int = 25) -> go.Figure:
+    """Top juzgados por procesos (resumen "juzgados"), coloreados por ciudad; la cola se agrupa en OTROS."""
+    columnas = [col_ciudad, col_juzgado, "PROCESOS", "CAPITAL_M"]
+    datos = agrupar_top(resumen_juzgado[columnas], col_juzgado, "PROCESOS", top=top)
+    datos[col_ciudad] = datos[col_ciudad].fillna("OTROS")
+    fig = px.bar(
+        datos.sort_values("PROCESOS"), x="PROCESOS", y=col_juzgado, color=col_ciudad, orientation="h",
+        hover_data={"CAPITAL_M": ":,.1f"}, template=PLANTILLA,
+    )
+    fig.update_layout(height=max(400, 24 * len(datos)), margin=dict(l=10, r=10, t=30, b=10),
+                      yaxis=dict(type="category", title=""))
+    return fig
+
+
+def dispersion_juzgados(resumen: pd.DataFrame, col_ciudad: str, col_juzgado: str, top: int = 300) -> go.Figure:
+    """Carga (procesos) vs P90 de días de exceso por juzgado; tamaño = capital, color = % GRAVE."""
+    datos = resumen.nlargest(top, "PROCESOS")
+    fig = px.scatter(
+        datos, x="PROCESOS", y="DIAS_EXCESO_P90", size="CAPITAL_M", color="% GRAVE",
+        hover_name=col_juzgado, hover_data={col_ciudad: True, "CAPITAL_M": ":,.1f", "% GRAVE": ":.1f"},
+        color_continuous_scale="RdYlGn_r", range_color=(0, 100), size_max=40,
+        labels={"DIAS_EXCESO_P90": "P90 días de exceso"}, template=PLANTILLA,
+    )
+    fig.update_layout(height=480, margin=dict(l=10, r=10, t=30, b=10))
+    return fig
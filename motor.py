@@ -0,0 +1,198 @@
+# ============================================
+# ⚙️ Motor de desviación procesal
+# Normalización, SLA condicional y clasificación por niveles
+# ============================================
+
+import unicodedata
+import numpy as np
+import pandas as pd
+
+from duplicados import deduplicar_operaciones, marcar_duplicados
+from subetapas import construir_indice, resolver_subetapas
+from validacion import COL_CODIGO, COL_DETALLE, describir_codigos, evaluar_reglas
+
+# ============================================
+# 🔠 MAPA MESES (ES)
+# ============================================
+MESES_ES = {
+    1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril",
+    5: "Mayo", 6: "Junio", 7: "Julio", 8: "Agosto",
+    9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
+}
+
+# ============================================
+# 🎯 SLA condicional y umbrales de desviación (%)
+# ============================================
+COS_SLA_SUBS = {"ENTREGA DE GARANTIAS", "ENTREGA PODER"}
+UMBRAL_LEVE = 30
+UMBRAL_MODERADA = 70
+
+# Códigos de nivel: el índice en NIVELES_DESVIACION es el código que devuelve clasificar_desviacion
+NIVELES_DESVIACION = ["A TIEMPO", "LEVE", "MODERADA", "GRAVE", "SIN SLA"]
+COD_SIN_SLA = NIVELES_DESVIACION.index("SIN SLA")
+
+
+# ============================================
+# 🧩 FUNCIÓN DE NORMALIZACIÓN DE COLUMNAS
+# ============================================
+def normalizar_columna(col: str) -> str:
+    col = ''.join(c for c in unicodedata.normalize('NFD', col) if unicodedata.category(c) != 'Mn')
+    col = col.upper().replace("-", "_").replace(" ", "_")
+    col = ''.join(c for c in col if c.isalnum() or c == "_")
+    while "__" in col:
+        col = col.replace("__", "_")
+    return col.strip("_")
+
+
+# ============================================
+# 🧮 Clasificación vectorizada (acepta broadcasting)
+# ============================================
+def sin_sla_mask(etapa, sub) -> np.ndarray:
+    """PASE A LEGAL solo tiene SLA COS en las subetapas de COS_SLA_SUBS."""
+    etapa = pd.Series(etapa, dtype="object").astype(str).str.upper()
+    sub = pd.Series(sub, dtype="object").astype(str).str.upper()
+    return ((etapa == "PASE A LEGAL") & ~sub.isin(COS_SLA_SUBS)).to_numpy()
+
+
+def clasificar_desviacion(dias, var, sin_sla):
+    """
+    Devuelve (porc, codigo) con la misma regla de ensure_metrics_all:
+    porc = max((var - dias) / dias * 100, 0); SIN SLA si no aplica SLA o dias <= 0.
+    `dias`, `var` y `sin_sla` pueden tener formas distintas mientras sean broadcastables
+    (p. ej. (n, 1) contra (1, H) para proyectar un horizonte completo de una vez).
+    """
+    dias = np.asarray(dias, dtype=float)
+    var = np.asarray(var, dtype=float)
+    sin_sla = np.asarray(sin_sla, dtype=bool) | ~(dias > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        porc = np.maximum((var - dias) / dias * 100, 0)
+    porc = np.where(sin_sla, 0.0, porc)
+    codigo = np.select(
+        [sin_sla, porc == 0, porc <= UMBRAL_LEVE, porc <= UMBRAL_MODERADA],
+        [COD_SIN_SLA, 0, 1, 2],
+        default=3,
+    )
+    return porc, codigo
+
+
+# ============================================
+# 🧮 Utilidad: asegurar métricas globales con SLA condicional
+# ============================================
+def ensure_metrics_all(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.copy()
+    for c in ["DIAS_POR_ETAPA", "VAR_FECHA_CALCULADA", "CAPITAL_ACT"]:
+        if c in out.columns:
+            out[c] = pd.to_numeric(out[c], errors="coerce").fillna(0)
+        else:
+            out[c] = 0
+    out["ETAPA_JURIDICA"] = out.get("ETAPA_JURIDICA", "").astype(str).str.upper()
+    out["SUB_ETAPA_JURIDICA"] = out.get("SUB_ETAPA_JURIDICA", "").astype(str).str.upper()
+
+    dias = out["DIAS_POR_ETAPA"].to_numpy(dtype=float)
+    var = out["VAR_FECHA_CALCULADA"].to_numpy(dtype=float)
+    porc, codigo = clasificar_desviacion(
+        dias, var, sin_sla_mask(out["ETAPA_JURIDICA"], out["SUB_ETAPA_JURIDICA"])
+    )
+    out["PORC_DESVIACION"] = porc
+    out["NIVEL_DESVIACION"] = np.take(np.array(NIVELES_DESVIACION, dtype=object), codigo)
+
+    out["ESTADO_TIEMPO"] = np.where(
+        codigo == COD_SIN_SLA, "SIN SLA",
+        np.where(porc > 0, "FUERA DE TIEMPO", "A TIEMPO")
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["PORC_AVANCE"] = np.where(dias > 0, var / dias * 100, 0.0)
+    return out
+
+
+# ============================================
+# 📘 PASOS 1–4 — Carga, JOIN de SLA y VAR_FECHA_CALCULADA (sin UI)
+# ============================================
+TIEMPOS_PATH = "Tabla_tiempos_etapas_desviacion.xlsx"  # tabla fija en raíz (repositorio)
+COL_SUB_INV, COL_SUB_TIEMPOS = "SUB_ETAPA_JURIDICA", "DESCRIPCION_DE_LA_SUBETAPA"
+COL_DIAS, COL_DURACION = "DIAS_POR_ETAPA", "DURACION_MAXIMA_EN_DIAS"
+COL_LLAVE_SLA = "_SUB_ETAPA_SLA"
+COLUMNAS_FECHA = ["FECHA_ACT_INVENTARIO", "FECHA_ACT_ETAPA"]
+
+
+def leer_excel_normalizado(fuente) -> pd.DataFrame:
+    """Pasos 1–2: lee un .xlsx (ruta, bytes o archivo) y normaliza encabezados."""
+    df = pd.read_excel(fuente)
+    df.columns = [normalizar_columna(c) for c in df.columns]
+    return df
+
+
+def completar_dias_por_etapa(inv: pd.DataFrame, tiempos: pd.DataFrame,
+                             alias: dict | None = None, indice: dict | None = None) -> pd.DataFrame:
+    """
+    Paso 3: JOIN por subetapa para completar DIAS_POR_ETAPA.
+    La llave del JOIN se resuelve por valor distinto (exacto, alias confirmado o normalizado),
+    así que SUB_ETAPA_JURIDICA conserva el texto original del inventario.
+    """
+    if COL_DIAS not in inv.columns:
+        inv[COL_DIAS] = None
+
+    indice = indice or construir_indice(tiempos[COL_SUB_TIEMPOS])
+    inv[COL_LLAVE_SLA] = inv[COL_SUB_INV].map(resolver_subetapas(inv[COL_SUB_INV], indice, alias))
+
+    # La tabla repite algunas subetapas en varias etapas (RECURSO, SENTENCIA A FAVOR DEL ...)
+    # con la misma duración: una fila por subetapa para que el JOIN no duplique procesos
+    inv = inv.merge(
+        tiempos[[COL_SUB_TIEMPOS, COL_DURACION]].drop_duplicates(COL_SUB_TIEMPOS),
+        how="left",
+        left_on=COL_LLAVE_SLA,
+        right_on=COL_SUB_TIEMPOS,
+        suffixes=("", "_T")
+    ).drop(columns=[COL_LLAVE_SLA])
+    inv[COL_DIAS] = inv[COL_DIAS].fillna(inv[COL_DURACION])
+    return inv
+
+
+def calcular_var_fecha(inv: pd.DataFrame):
+    """
+    Paso 4: convierte fechas (día/mes/año), calcula VAR_FECHA_CALCULADA y aplica REGLAS_PASO4.
+    Devuelve (inv, errores, base_limpia). Lanza ValueError si faltan columnas de fecha.
+    """
+    # 1️⃣ Validar que existan las columnas mínimas
+    for c in COLUMNAS_FECHA:
+        if c not in inv.columns:
+            raise ValueError(f"Falta la columna {c} en el inventario.")
+
+    # 2️⃣ Convertir fechas con formato latino (día/mes/año)
+    # Corrige casos tipo "11/10/2025" que antes se interpretaban como 10 de noviembre
+    inv["FECHA_ACT_INVENTARIO"] = pd.to_datetime(inv["FECHA_ACT_INVENTARIO"], errors="coerce", dayfirst=True)
+
+    # Limpieza previa de milisegundos o comas (ej: "11/10/2025 12:33:30,347")
+    inv["FECHA_ACT_ETAPA"] = inv["FECHA_ACT_ETAPA"].astype(str).str.replace(",", ".", regex=False)
+    inv["FECHA_ACT_ETAPA"] = pd.to_datetime(inv["FECHA_ACT_ETAPA"], errors="coerce", dayfirst=True)
+
+    # 3️⃣ VAR_FECHA_CALCULADA (diferencia en días). Una etapa "futura" (error de formato)
+    # cuenta como 0 días, sin sobrescribir la FECHA_ACT_ETAPA reportada.
+    inv["VAR_FECHA_CALCULADA"] = (
+        inv["FECHA_ACT_INVENTARIO"].dt.normalize() - inv["FECHA_ACT_ETAPA"].dt.normalize()
+    ).dt.days.clip(lower=0)
+
+    # 4️⃣ Reglas de validación en una pasada (bitmask por fila)
+    codigos, excluidas = evaluar_reglas(inv)
+    inv[COL_CODIGO] = codigos
+    inv[COL_DETALLE] = describir_codigos(inv[COL_CODIGO])
+
+    # 5️⃣ Registros con alguna regla incumplida y base limpia (sin reglas excluyentes)
+    errores = inv[inv[COL_CODIGO] != 0].copy()
+    base_limpia = inv[~excluidas].copy()
+    return inv, errores, base_limpia
+
+
+def procesar_inventario(inv: pd.DataFrame, tiempos: pd.DataFrame,
+                        alias: dict | None = None, indice: dict | None = None, deduplicar: bool = False):
+    """
+    Pasos 3–5 completos. Devuelve (inv, errores, df_all).
+    Con `deduplicar`, df_all conserva una fila por OPERACION (la de FECHA_ACT_ETAPA más reciente).
+    """
+    inv = completar_dias_por_etapa(inv, tiempos, alias, indice)
+    inv = marcar_duplicados(inv)
+    inv, errores, base_limpia = calcular_var_fecha(inv)
+    if deduplicar:
+        base_limpia = deduplicar_operaciones(base_limpia)
+    return inv, errores, ensure_metrics_all(base_limpia)
@@ -0,0 +1,52 @@
+# ============================================
+# 🏦 BLOQUE FINAL — Procesos bajo control del Banco (No incluidos en SLA COS)
+# ============================================
+
+import streamlit as st
+
+from datos import archivo_descarga, obtener_dataset, obtener_resumenes
+from graficos import tendencia_banco
+from precalculo import LIBRO_BANCO
+from resumenes import base_banco
+
+dataset = obtener_dataset()
+df_all = dataset["df_all"]
+
+st.header("🏦 Procesos bajo control del Banco (No incluidos en SLA de la desviacion procesal gnb 🌳)")
+# ============================================
+# 🏦 BLOQUE BANCO — Procesos SIN SLA
+# ============================================
+dfb = base_banco(df_all)
+
+st.write(f"📊 Procesos clasificados SIN SLA (bajo control del Banco): {len(dfb):,}")
+
+if dfb.empty:
+    st.info("✅ No hay procesos bajo control del banco para mostrar.")
+else:
+    # Año × Mes × Subetapa, Año × Mes y TOTAL en un solo rollup (resumen_banco)
+    resumenes = obtener_resumenes(dataset, "banco")
+    resumen_mensual_tot = resumenes["banco_mensual"]
+    resumen_sub_mensual_tot = resumenes["banco_subetapa_mensual"]
+
+    st.subheader("🗓️ Resumen mensual (Año × Mes) — Banco")
+    st.dataframe(
+        resumen_mensual_tot.style.background_gradient(subset=["CAPITAL_M"], cmap="YlOrRd")
+        .format({"CAPITAL_M": "{:,.1f}", "PROCESOS": "{:,}", "CLIENTES": "{:,}", "% PROCESOS": "{:.1f} %"}),
+        use_container_width=True, height=300
+    )
+
+    st.subheader("📈 Tendencia mensual — Banco")
+    st.plotly_chart(tendencia_banco(resumen_mensual_tot), use_container_width=True)
+
+    st.subheader("⚖️ Resumen por Subetapa × Mes × Año (Banco)")
+    st.dataframe(
+        resumen_sub_mensual_tot.style.background_gradient(subset=["CAPITAL_M"], cmap="YlOrRd")
+        .format({"CAPITAL_M": "{:,.1f}", "PROCESOS": "{:,}", "CLIENTES": "{:,}", "% PROCESOS": "{:.1f} %"}),
+        use_container_width=True, height=380
+    )
+
+    st.download_button(
+        "⬇️ Descargar Procesos del Banco (ambos resúmenes)",
+        data=archivo_descarga(dataset, LIBRO_BANCO), file_name=LIBRO_BANCO,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
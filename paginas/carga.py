@@ -0,0 +1,86 @@
+# ============================================
+# 📆 PASO 4 — Validación de fechas del inventario cargado
+# ============================================
+
+import streamlit as st
+
+from datos import CLAVE_DEDUP, indice_subetapas, archivo_descarga, obtener_dataset
+from duplicados import resumen_duplicados
+from precalculo import LIBRO_ERRORES
+from motor import COL_SUB_INV, COL_SUB_TIEMPOS
+from subetapas import guardar_alias, sugerir_subetapas
+from validacion import COL_CODIGO, conteo_reglas
+
+dataset = obtener_dataset()
+errores = dataset["errores"]
+total_errores = len(errores)
+total_leidos = len(dataset["inventario"])
+total_validos = len(dataset["df_all"])
+
+st.header("📆 Carga y validación del inventario")
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("📄 Registros leídos", f"{total_leidos:,}")
+c2.metric("✅ Registros válidos", f"{total_validos:,}")
+c3.metric("⛔ Excluidos (fecha o duplicado)", f"{total_leidos - total_validos:,}")
+c4.metric("⚠️ Registros con alguna regla incumplida", f"{total_errores:,}")
+
+# 8️⃣ Reporte visual y descarga
+if total_errores > 0:
+    st.warning(f"⚠️ {total_errores:,} registros incumplen al menos una regla de validación.")
+    st.dataframe(
+        conteo_reglas(errores[COL_CODIGO]).style.format({"REGISTROS": "{:,}"}),
+        use_container_width=True, hide_index=True
+    )
+    st.download_button(
+        "⬇️ Descargar registros con errores",
+        data=archivo_descarga(dataset, LIBRO_ERRORES),
+        file_name=LIBRO_ERRORES,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+else:
+    st.success("✅ Ningún registro incumple las reglas de validación.")
+
+# ============================================
+# 🧬 Duplicados y consistencia OPERACION / DEUDOR
+# ============================================
+duplicados = resumen_duplicados(dataset["inventario"])
+if duplicados["REGISTROS"].sum() > 0:
+    st.subheader("🧬 Operaciones duplicadas o inconsistentes")
+    st.dataframe(duplicados.style.format({"REGISTROS": "{:,}", "OPERACIONES": "{:,}"}),
+                 use_container_width=True, hide_index=True)
+    if st.session_state.get(CLAVE_DEDUP):
+        st.info("🧹 Deduplicación activa: los resúmenes usan una fila por OPERACION (la etapa más reciente).")
+    else:
+        st.caption("Activa **Una fila por OPERACION** en la barra lateral para no contar dos veces el capital.")
+
+# ============================================
+# 🔤 Subetapas sin cruce con la tabla de tiempos
+# ============================================
+inv = dataset["inventario"]
+sin_cruce = inv.loc[inv[COL_SUB_TIEMPOS].isna(), COL_SUB_INV].dropna().unique()
+
+
+# Fragmento: editar las confirmaciones no vuelve a ejecutar la página
+@st.fragment
+def alias_subetapas(sin_cruce):
+    st.subheader("🔤 Subetapas del inventario sin SLA por diferencias de nombre")
+    sugerencias = sugerir_subetapas(sin_cruce, indice_subetapas())
+    if sugerencias.empty:
+        st.success("✅ Todas las subetapas del inventario cruzan con la tabla de tiempos (o no tienen un parecido claro).")
+        return
+
+    st.caption("Marca las sugerencias correctas. Los alias confirmados se guardan y se aplican en las próximas cargas.")
+    editadas = st.data_editor(
+        sugerencias,
+        disabled=["SUB_ETAPA_INVENTARIO", "SUGERENCIA_TABLA", "PUNTAJE"],
+        column_config={"PUNTAJE": st.column_config.ProgressColumn("PUNTAJE", min_value=0, max_value=1, format="%.2f")},
+        use_container_width=True, hide_index=True, key="editor_alias",
+    )
+    confirmadas = editadas[editadas["CONFIRMAR"]]
+    if st.button(f"💾 Guardar {len(confirmadas)} alias confirmados", disabled=confirmadas.empty):
+        guardar_alias(dict(zip(confirmadas["SUB_ETAPA_INVENTARIO"], confirmadas["SUGERENCIA_TABLA"])))
+        st.rerun(scope="app")
+
+
+if len(sin_cruce) > 0:
+    alias_subetapas(sin_cruce)
@@ -0,0 +1,358 @@
+# ============================================
+# 🤖 ANÁLISIS AUTOMÁTICO CON IA — CHRIS IA 🩵 (Versión Jurídica Bancaria)
+# ============================================
+
+import unicodedata
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from datos import obtener_dataset, obtener_perfil
+from motor import UMBRAL_LEVE
+from perfil import perfil_markdown
+
+dataset = obtener_dataset()
+df_all = dataset["df_all"]
+# Perfil de tamaño fijo (perfil.py): los prompts no crecen con el inventario
+perfil = obtener_perfil(dataset)
+
+
+@st.cache_resource(show_spinner=False)
+def cliente_openai():
+    # openai se importa solo cuando esta página lo necesita, y el cliente se crea una vez
+    from openai import OpenAI
+    return OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+
+
+st.markdown("### 🤖 Análisis Automático con IA — Informe Jurídico Comercial (CHRIS IA 🩵)")
+
+# Fragmento: el botón solo vuelve a ejecutar este bloque
+@st.fragment
+def informe_juridico(perfil: dict):
+    try:
+        client = cliente_openai()
+        fecha_actual = datetime.now().strftime("%d/%m/%Y")
+
+        if st.button("🧠 Generar Informe Jurídico con IA"):
+            with st.spinner("CHRIS IA está analizando los resultados..."):
+                resumen = perfil_markdown(perfil)
+
+                prompt = f"""
+Eres un abogado especializado en procesos comerciales y demandas a clientes en mora del sector bancario colombiano.
+
+Con base en el siguiente perfil estadístico de los procesos judiciales en curso
+(PORC_DESVIACION ya está expresado en %; capital en millones):
+
+{resumen}
+
+Redacta un **Informe Gerencial Jurídico** para Contacto Solutions que incluya:
+
+1. Interpretación general de los resultados con lenguaje técnico-jurídico.
+2. Identificación de las etapas con mayor desviación y explicación de las posibles causas desde una perspectiva legal y operativa.
+3. Recomendaciones concretas para optimizar la gestión procesal, prevenir incumplimientos y mejorar la eficiencia.
+4. Un tono formal, objetivo y propio de un abogado litigante del área de cobranza judicial bancaria.
+5. Al final, agrega un bloque de firma con esta estructura:
+
+---
+**Informe Jurídico elaborado por:** CHRIS IA 🩵  
+**Área:** Control Procesal Bancario – Contacto Solutions  
+**Fecha:** {fecha_actual}
+---
+"""
+
+                respuesta = client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Eres un abogado colombiano experto en derecho comercial y procesos ejecutivos bancarios.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=700,
+                )
+
+                texto_ia = respuesta.choices[0].message.content.strip()
+
+                st.success("✅ Informe jurídico generado correctamente por CHRIS IA 🩵")
+                st.markdown("#### 📋 Resultado del Análisis Jurídico:")
+                st.markdown(texto_ia)
+
+                st.session_state["analisis_ia_chris"] = {
+                    "texto": texto_ia,
+                    "fecha": fecha_actual
+                }
+
+    except Exception as e:
+        st.warning(f"⚠️ No se pudo ejecutar el análisis IA: {e}")
+        st.info("Verifica que tu archivo `.streamlit/secrets.toml` contenga la clave `OPENAI_API_KEY`.")
+
+
+informe_juridico(perfil)
+
+# ============================================
+# 🧠 IA CORRECTIVA — Diagnóstico de Desviaciones (CHRIS IA 🩵)
+# ============================================
+
+st.markdown("### 🧩 Diagnóstico IA — Análisis Correctivo de Desviaciones (CHRIS IA 🩵)")
+
+# Fragmento: el botón solo vuelve a ejecutar este bloque
+@st.fragment
+def diagnostico_correctivo(perfil: dict):
+    try:
+        client = cliente_openai()
+        fecha_actual = datetime.now().strftime("%d/%m/%Y")
+
+        if st.button("🔍 Analizar Causas y Errores con CHRIS IA"):
+            with st.spinner("CHRIS IA está revisando las desviaciones..."):
+                # Distribuciones por etapa/subetapa, juzgados y los casos con mayor desviación
+                if "casos_extremos" in perfil:
+                    muestra = perfil_markdown(perfil, ["etapas", "subetapas", "juzgados", "casos_extremos"])
+                else:
+                    muestra = "No se encontró la columna PORC_DESVIACION en el dataset."
+
+                prompt = f"""
+Eres un abogado especialista en control procesal del sector bancario. 
+Tu tarea es revisar el siguiente perfil de los procesos judiciales con mayor desviación
+(PORC_DESVIACION ya está expresado en %; capital en millones):
+
+{muestra}
+
+Analiza las posibles causas jurídicas y operativas que podrían estar generando las desviaciones 
+(en errores de fechas, tipificación, carga judicial o demoras del banco).
+Redacta una tabla explicativa con las siguientes columnas:
+
+1. ETAPA_JURIDICA  
+2. POSIBLE CAUSA DE DESVIACIÓN  
+3. RECOMENDACIÓN CORRECTIVA  
+
+Sé concreto, utiliza terminología jurídica colombiana y redacta con tono técnico-profesional.
+Al final, agrega un párrafo resumen con la visión global del problema y su impacto operativo.
+Firma como:
+
+---
+**Análisis Correctivo elaborado por:** CHRIS IA 🩵  
+**Fecha:** {fecha_actual}
+---
+"""
+
+                respuesta = client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Eres un abogado litigante experto en procesos ejecutivos del sector bancario colombiano.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=900,
+                )
+
+                texto_ia_corr = respuesta.choices[0].message.content.strip()
+
+                st.success("✅ Diagnóstico correctivo generado correctamente por CHRIS IA 🩵")
+                st.markdown("#### 📋 Resultado del Análisis Correctivo:")
+                st.markdown(texto_ia_corr)
+
+                st.session_state["analisis_ia_correctivo"] = {
+                    "texto": texto_ia_corr,
+                    "fecha": fecha_actual
+                }
+
+    except Exception as e:
+        st.warning(f"⚠️ No se pudo ejecutar el análisis IA: {e}")
+        st.info("Verifica tu archivo `.streamlit/secrets.toml` con la clave `OPENAI_API_KEY`.")
+
+
+diagnostico_correctivo(perfil)
+
+# ============================================
+# 💬 CHRIS IA 🩵 — Analista Jurídico + Data Analyst Procesal y Financiero (Versión robusta)
+# ============================================
+
+st.markdown("### 💬 CHRIS IA 🩵 — Análisis Conversacional con Cálculos Reales y Contexto Completo")
+
+# Fragmento: cada pregunta del chat solo vuelve a ejecutar la conversación
+@st.fragment
+def chat_chris(df_all: pd.DataFrame, perfil: dict):
+    try:
+        client = cliente_openai()
+
+        # =======================================================
+        # 🎯 CONTEXTO Y PERSONALIDAD DEL MODELO (ROL DUAL)
+        # =======================================================
+        if "chat_chris" not in st.session_state:
+            st.session_state["chat_chris"] = [
+                {
+                    "role": "system",
+                    "content": """
+Eres CHRIS IA 🩵, analista senior de bases de datos procesales y abogado experto en cobranza judicial bancaria.
+
+Tu función principal es analizar datos reales del DataFrame `df_all` de Contacto Solutions, que contiene:
+- JUZGADO, CIUDAD, DEPARTAMENTO
+- ETAPA_JURIDICA, SUB_ETAPA_JURIDICA, PORC_DESVIACION
+- CAPITAL, SUBTOTAL, CAPITAL_ACT, CAPITAL_TOTAL
+- CICLOS_MORA, DIAS_RESTANTES_VENCIMIENTO
+- NOMBRE_CLIENTE, CEDULA_CLIENTE, OPERACION
+
+Debes comportarte como un **data analyst jurídico**, con estas reglas:
+
+1️⃣ **Prioriza los datos exactos.**  
+   Si existen cálculos (conteos, promedios, sumas, porcentajes), repórtalos directamente con cifras.  
+   Si no hay datos suficientes, especifica qué columnas faltan.
+
+2️⃣ **Calcula y analiza.**  
+   Usa los resultados entregados por Python (promedios, sumas o conteos) para generar conclusiones numéricas.
+
+3️⃣ **Habla con lenguaje técnico-financiero y jurídico.**  
+   Redacta conclusiones claras, precisas y con base en números concretos.
+
+4️⃣ **Estructura las respuestas en este formato:**
+   - Resumen numérico o hallazgo exacto  
+   - Interpretación jurídica y operativa  
+   - Recomendación o conclusión  
+
+Si se te proporcionan resultados de cálculos, utiliza los porcentajes y montos como fundamento de tus análisis.
+"""
+                }
+            ]
+
+        # =======================================================
+        # 💬 HISTORIAL Y CAMPO DE CHAT
+        # =======================================================
+        for msg in st.session_state["chat_chris"][1:]:
+            with st.chat_message(msg["role"]):
+                st.markdown(msg["content"])
+
+        pregunta = st.chat_input("Escribe tu pregunta jurídica o financiera sobre la base...")
+
+        if pregunta:
+            st.session_state["chat_chris"].append({"role": "user", "content": pregunta})
+            with st.chat_message("user"):
+                st.markdown(pregunta)
+
+            # =======================================================
+            # 📊 CÁLCULOS AUTOMÁTICOS ROBUSTOS SEGÚN LA BASE
+            # =======================================================
+            calculos_texto = ""
+            try:
+                df_temp = df_all.copy()
+
+                # 1️⃣ Normalizar nombres de columnas
+                def normalizar_col(col):
+                    col = (
+                        unicodedata.normalize("NFKD", col)
+                        .encode("ascii", "ignore")
+                        .decode("utf-8")
+                        .upper()
+                        .replace(" ", "_")
+                        .replace(".", "")
+                        .replace("%", "")
+                    )
+                    return col
+
+                df_temp.columns = [normalizar_col(c) for c in df_temp.columns]
+
+                # 2️⃣ Detección automática de columnas relevantes
+                posibles_juzgado = [c for c in df_temp.columns if "JUZG" in c]
+                posibles_ciudad = [c for c in df_temp.columns if "CIUDAD" in c]
+                posibles_desv = [c for c in df_temp.columns if "DESV" in c or "PORC" in c]
+                posibles_capital = [c for c in df_temp.columns if "CAPITAL" in c or "SUBTOTAL" in c]
+
+                col_juzgado = posibles_juzgado[0] if posibles_juzgado else None
+                col_ciudad = posibles_ciudad[0] if posibles_ciudad else None
+                col_desv = posibles_desv[0] if posibles_desv else None
+                col_capital = posibles_capital[0] if posibles_capital else None
+
+                # 3️⃣ Validar existencia de columnas críticas
+                if all([col_juzgado, col_ciudad, col_desv]):
+                    df_temp[col_desv] = pd.to_numeric(df_temp[col_desv], errors="coerce")
+                    df_desv = df_temp[df_temp[col_desv] > UMBRAL_LEVE]
+
+                    if not df_desv.empty:
+                        resumen = (
+                            df_desv.groupby([col_ciudad, col_juzgado])
+                            .agg(
+                                PROCESOS=("OPERACION", "count") if "OPERACION" in df_temp.columns else ("index", "count"),
+                                DESVIACION_PROM=(col_desv, "mean"),
+                                CAPITAL_TOTAL=(col_capital, "sum") if col_capital else ("index", "count")
+                            )
+                            .reset_index()
+                            .sort_values(["PROCESOS", "DESVIACION_PROM"], ascending=[False, False])
+                        )
+
+                        # Top 1 y Top 5
+                        top = resumen.head(1)
+                        top5 = resumen.head(5)
+
+                        ciudad_top = top.iloc[0][col_ciudad]
+                        juzgado_top = top.iloc[0][col_juzgado]
+                        procesos_top = int(top.iloc[0]["PROCESOS"])
+                        desv_top = top.iloc[0]["DESVIACION_PROM"]
+                        capital_top = top.iloc[0]["CAPITAL_TOTAL"]
+
+                        calculos_texto = f"""
+📊 **Cálculos automáticos sobre la base:**
+• Juzgado con más procesos desviados: **{juzgado_top}**
+• Ciudad: **{ciudad_top}**
+• Procesos desviados: **{procesos_top}**
+• Desviación promedio: **{desv_top:.1f} %**
+• Capital total gestionado: **${capital_top:,.0f}**
+
+**Top 5 Juzgados con más procesos desviados:**
+{top5.to_string(index=False)}
+"""
+                    else:
+                        calculos_texto = f"✅ No se encontraron procesos con desviación superior al {UMBRAL_LEVE}%."
+
+                else:
+                    faltantes = []
+                    if not col_juzgado: faltantes.append("JUZGADO")
+                    if not col_ciudad: faltantes.append("CIUDAD")
+                    if not col_desv: faltantes.append("PORC_DESVIACION")
+                    calculos_texto = f"⚠️ No se detectaron columnas clave: {', '.join(faltantes)}."
+
+            except Exception as calc_err:
+                calculos_texto = f"⚠️ Error durante el cálculo: {calc_err}"
+
+            # =======================================================
+            # 🧠 PROMPT IA CON CÁLCULOS REALES
+            # =======================================================
+            prompt = f"""
+Pregunta del usuario:
+{pregunta}
+
+Resultados de los cálculos realizados sobre la base:
+{calculos_texto}
+
+Perfil general de la base:
+{perfil_markdown(perfil, ["general", "estado", "capital_riesgo"])}
+
+Actúa como abogado-analista de datos procesales.
+Responde con precisión numérica, interpreta los resultados en contexto jurídico y financiero,
+y entrega recomendaciones de control procesal o mejora operativa.
+"""
+
+            # =======================================================
+            # 🗣️ RESPUESTA DE CHRIS IA 🩵
+            # =======================================================
+            with st.chat_message("assistant"):
+                with st.spinner("CHRIS IA 🩵 está analizando los resultados y redactando el informe..."):
+                    respuesta = client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=st.session_state["chat_chris"]
+                        + [{"role": "user", "content": prompt}],
+                        max_tokens=900,
+                    )
+                    texto_resp = respuesta.choices[0].message.content.strip()
+                    st.markdown(texto_resp)
+
+            st.session_state["chat_chris"].append({"role": "assistant", "content": texto_resp})
+
+    except Exception as e:
+        st.warning(f"⚠️ Error en CHRIS IA 🩵: {e}")
+        st.info("Verifica que tu archivo `.streamlit/secrets.toml` contenga la clave OPENAI_API_KEY correctamente configurada.")
+
+
+chat_chris(df_all, perfil)
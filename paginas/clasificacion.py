@@ -0,0 +1,110 @@
+# ============================================
+# 📊 % Avance, % Desviación y Clasificación (Global)
+# ============================================
+
+import streamlit as st
+
+from datos import archivo_descarga, obtener_dataset, obtener_resumenes
+from exportar import MIME_ARROW_ARCHIVO, MIME_PARQUET, MIME_ZIP
+from graficos import barras_capital_nivel, distribucion_juzgados
+from precalculo import (
+    ARROW_CLASIFICADO, ARROW_RESUMENES, LIBRO_CLASIFICADO, PARQUET_CLASIFICADO, PARQUET_PARTICIONADO, PARQUET_RESUMENES,
+)
+from resumenes import vista_global
+
+dataset = obtener_dataset()
+resumenes = obtener_resumenes(dataset, "clasificacion", "juzgados")
+df5 = vista_global(dataset["df_all"])
+
+total_procesos = len(df5)
+total_clientes = df5["DEUDOR"].nunique() if "DEUDOR" in df5.columns else 0
+capital_total = df5["CAPITAL_MILLONES"].sum()
+desviados = (df5["ESTADO_TIEMPO"] == "FUERA DE TIEMPO").sum()
+
+st.header("📊 % Avance, % Desviación y Clasificación (Global)")
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("🧾 Procesos totales", f"{total_procesos:,}")
+c2.metric("👤 Clientes únicos", f"{total_clientes:,}")
+c3.metric("💰 Capital total", f"${capital_total:,.1f} M")
+c4.metric("⚠️ Procesos con desviación", f"{desviados:,}")
+
+st.subheader("📋 Estado general de los procesos")
+st.dataframe(
+    resumenes["estado"].style.background_gradient(subset=["CAPITAL"], cmap="Greens").format({
+        "CAPITAL": "{:,.1f}", "% DEL TOTAL": "{:.1f} %"
+    }),
+    use_container_width=True, height=150
+)
+
+gravedad = resumenes["gravedad"].set_index("NIVEL_DESVIACION")
+if not gravedad.empty:
+    st.subheader("📋 Niveles de gravedad de desviación")
+    st.dataframe(
+        gravedad.style.background_gradient(subset=["% CAPITAL DESVIADO"], cmap="RdYlGn_r").format({
+            "CAPITAL": "{:,.1f}", "% CAPITAL DESVIADO": "{:.1f} %"
+        }),
+        use_container_width=True, height=180
+    )
+
+st.subheader("💰 Capital por nivel de desviación")
+st.plotly_chart(barras_capital_nivel(resumenes["nivel"]), use_container_width=True)
+
+if "etapas" in resumenes:
+    etapa_rank = resumenes["etapas"]
+    st.subheader("🏛️ Ranking por Etapa Jurídica (todas)")
+    st.dataframe(
+        etapa_rank.style.background_gradient(subset=["PROM_DESV"], cmap="RdYlGn_r").format({
+            "CAPITAL": "{:,.1f}", "PROM_DESV": "{:.1f} %"
+        }),
+        use_container_width=True, height=300
+    )
+
+if "subetapas" in resumenes:
+    sub_rank = resumenes["subetapas"]
+    st.subheader("📚 Ranking por Subetapa Jurídica (todas)")
+    st.dataframe(
+        sub_rank.style.background_gradient(subset=["PROM_DESV"], cmap="RdYlGn_r").format({
+            "CAPITAL": "{:,.1f}", "PROM_DESV": "{:.1f} %"
+        }),
+        use_container_width=True, height=350
+    )
+
+if "juzgados" in resumenes:
+    # Mismo resumen Ciudad × Juzgado de la página de Juzgados (columnas resueltas con columna_con)
+    resumen_juzgado = resumenes["juzgados"]
+    col_ciudad, col_juzgado = resumen_juzgado.columns[:2]
+    st.subheader("🏛️ Distribución por Juzgado y Ciudad")
+    st.plotly_chart(
+        distribucion_juzgados(resumen_juzgado.dropna(subset=[col_juzgado]), col_ciudad, col_juzgado),
+        use_container_width=True,
+    )
+
+st.download_button(
+    "⬇️ Descargar Inventario Clasificado",
+    data=archivo_descarga(dataset, LIBRO_CLASIFICADO), file_name=LIBRO_CLASIFICADO,
+    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+)
+
+# ============================================
+# 📦 Exportación columnar (Parquet / Arrow) para BI
+# ============================================
+# Fragmento: elegir y preparar el archivo no vuelve a ejecutar la página
+@st.fragment
+def exportacion_columnar(dataset: dict):
+    st.caption("Se generan al pedirlas (o las deja listas el vigilante). El .zip particionado "
+               "sigue el formato Hive: ETAPA_JURIDICA=…/MES_INVENTARIO=…/*.parquet.")
+    formatos = {
+        PARQUET_CLASIFICADO: ("Inventario clasificado (.parquet)", MIME_PARQUET),
+        PARQUET_PARTICIONADO: ("Inventario por Etapa × Mes de inventario (.zip Parquet)", MIME_ZIP),
+        ARROW_CLASIFICADO: ("Inventario clasificado (Arrow IPC)", MIME_ARROW_ARCHIVO),
+        PARQUET_RESUMENES: ("Todos los resúmenes (.zip Parquet)", MIME_ZIP),
+        ARROW_RESUMENES: ("Todos los resúmenes (.zip Arrow IPC)", MIME_ZIP),
+    }
+    nombre = st.radio("Archivo", list(formatos), format_func=lambda n: formatos[n][0], horizontal=True)
+    if st.button("⚙️ Preparar descarga"):
+        st.download_button(f"⬇️ Descargar {nombre}", data=archivo_descarga(dataset, nombre),
+                           file_name=nombre, mime=formatos[nombre][1])
+
+
+with st.expander("📦 Descargas Parquet / Arrow (conservan tipos de columna)"):
+    exportacion_columnar(dataset)
@@ -0,0 +1,132 @@
+# ============================================
+# 📊 Clientes Críticos (Global) (Busqueda segmentada)
+# ============================================
+
+import pandas as pd
+import streamlit as st
+from io import BytesIO
+
+from datos import archivo_descarga, obtener_dataset
+from precalculo import LIBRO_CLIENTES
+from resumenes import dias_exceso, vista_global
+from riesgo import NIVEL_CRITICO, PESOS_SCORE, metricas_clientes, top_criticos
+
+dataset = obtener_dataset()
+df_all = dataset["df_all"]
+
+df7 = vista_global(df_all)
+df7["DIAS_EXCESO"] = dias_exceso(df7)
+
+# Una pasada por DEUDOR: capital, desviación ponderada por capital, días de exceso y GRAVES
+resumen_cliente = metricas_clientes(df7)
+graves = resumen_cliente[resumen_cliente["NIVEL"] == NIVEL_CRITICO]
+
+total_clientes = len(resumen_cliente)
+total_capital = resumen_cliente["CAPITAL_M"].sum()
+
+st.header("📊 Clientes Críticos (Global) con Buscador Multicliente y Obligación")
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("👤 Clientes totales", f"{total_clientes:,}")
+c2.metric("📁 Operaciones totales", f"{df7.shape[0]:,}")
+c3.metric("💰 Capital total", f"${total_capital:,.1f} M")
+c4.metric("🔴 Clientes críticos (Grave)", f"{len(graves):,}",
+          help="Desviación promedio ponderada por capital > 70 %")
+
+
+ETIQUETAS_PESOS = {
+    "DESV_PONDERADA": "% desviación ponderada por capital",
+    "DIAS_EXCESO_MAX": "Máximo de días de exceso (con SLA)",
+    "OPERACIONES_GRAVES": "Operaciones en GRAVE",
+}
+
+
+# Fragmento: mover K o los pesos solo recalcula el puntaje y el top-K
+@st.fragment
+def ranking_criticos(resumen_cliente: pd.DataFrame):
+    st.subheader("🎯 Top clientes por puntaje de riesgo")
+    k = st.slider("Clientes a mostrar (K)", min_value=10, max_value=500, value=50, step=10)
+    with st.expander("⚙️ Pesos del puntaje"):
+        st.caption("Cada componente se normaliza a 0–1 (tope en su percentil 99) y el puntaje va de 0 a 100.")
+        pesos = {
+            col: st.slider(ETIQUETAS_PESOS[col], min_value=0.0, max_value=1.0, value=peso, step=0.05)
+            for col, peso in PESOS_SCORE.items()
+        }
+
+    top = top_criticos(resumen_cliente, k, pesos)
+    st.dataframe(
+        top[["DEUDOR", "SCORE", "NIVEL", "OPERACIONES", "CAPITAL_M", "DESV_PONDERADA", "PROM_DESV",
+             "DIAS_EXCESO_MAX", "DIAS_EXCESO_PROM", "OPERACIONES_GRAVES"]]
+        .style.background_gradient(subset=["SCORE"], cmap="Reds")
+        .format({"SCORE": "{:.1f}", "CAPITAL_M": "{:,.1f}", "DESV_PONDERADA": "{:.1f} %", "PROM_DESV": "{:.1f} %",
+                 "DIAS_EXCESO_MAX": "{:.0f} días", "DIAS_EXCESO_PROM": "{:.0f} días"}),
+        use_container_width=True, height=400
+    )
+
+    out_top = BytesIO()
+    top.to_excel(out_top, index=False, sheet_name="Top_Clientes_Riesgo", engine="openpyxl")
+    out_top.seek(0)
+    st.download_button(
+        f"⬇️ Descargar Top {len(top)} clientes por riesgo",
+        data=out_top, file_name="Top_Clientes_Riesgo_Paso7_Global.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+ranking_criticos(resumen_cliente)
+
+st.subheader("🔴 Clientes Críticos (Grave) — Selecciona uno o varios para ver detalle")
+st.dataframe(
+    graves[["DEUDOR", "OPERACIONES", "CAPITAL_M", "DESV_PONDERADA", "PROM_DESV", "DIAS_EXCESO_PROM"]]
+    .sort_values("DESV_PONDERADA", ascending=False)
+    .style.background_gradient(subset=["DESV_PONDERADA"], cmap="Reds")
+    .format({"CAPITAL_M": "{:,.1f}", "DESV_PONDERADA": "{:.1f} %", "PROM_DESV": "{:.1f} %",
+             "DIAS_EXCESO_PROM": "{:.0f} días"}),
+    use_container_width=True, height=400
+)
+
+# Fragmento: cambiar la selección solo vuelve a ejecutar este bloque, no toda la página
+@st.fragment
+def detalle_clientes(df7: pd.DataFrame, graves: pd.DataFrame):
+    st.markdown("### 🔎 Buscar clientes y ver detalle de sus operaciones (con obligación)")
+    seleccion_clientes = st.multiselect(
+        "Escribe para buscar uno o varios clientes:",
+        options=graves["DEUDOR"].sort_values().unique(),
+        help="Puedes escribir parte del nombre o número y seleccionar varios."
+    )
+
+    if seleccion_clientes:
+        detalle = df7[df7["DEUDOR"].isin(seleccion_clientes)][
+            ["DEUDOR", "OPERACION", "ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA",
+             "VAR_FECHA_CALCULADA", "DIAS_EXCESO", "CAPITAL_ACT", "PORC_DESVIACION"]
+        ].copy()
+
+        st.markdown(f"#### 📂 Detalle de operaciones — {len(detalle)} registros seleccionados")
+        st.dataframe(
+            detalle.style.background_gradient(subset=["PORC_DESVIACION"], cmap="Reds")
+            .format({"CAPITAL_ACT": "${:,.0f}", "PORC_DESVIACION": "{:.1f} %", "DIAS_EXCESO": "{:.0f} días"}),
+            use_container_width=True, height=450
+        )
+
+        # Como DIAS_EXCESO_PROM del resumen: solo procesos con SLA
+        con_sla = df7.loc[detalle.index, "NIVEL_DESVIACION"] != "SIN SLA"
+        exceso_sla = detalle.loc[con_sla, "DIAS_EXCESO"]
+        st.info(f"**Resumen de selección:** Capital total ${detalle['CAPITAL_ACT'].sum():,.0f} — "
+                f"Promedio días exceso (con SLA) {exceso_sla.mean() if len(exceso_sla) else 0:.0f}")
+
+        out_det = BytesIO()
+        detalle.to_excel(out_det, index=False, sheet_name="Detalle_Seleccion", engine="openpyxl")
+        out_det.seek(0)
+        st.download_button(
+            "⬇️ Descargar detalle filtrado",
+            data=out_det, file_name="Detalle_Clientes_Seleccionados.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+
+detalle_clientes(df7, graves)
+
+st.download_button(
+    "⬇️ Descargar listado completo de Clientes Críticos",
+    data=archivo_descarga(dataset, LIBRO_CLIENTES), file_name=LIBRO_CLIENTES,
+    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+)
@@ -0,0 +1,67 @@
+# ============================================
+# 🏛️ Juzgados × Ciudad — carga y percentiles de desviación (Global)
+# ============================================
+
+import pandas as pd
+import streamlit as st
+from io import BytesIO
+
+from datos import archivo_descarga, obtener_dataset, obtener_resumenes
+from graficos import dispersion_juzgados
+from precalculo import LIBRO_JUZGADOS
+
+dataset = obtener_dataset()
+resumenes = obtener_resumenes(dataset, "juzgados")
+
+st.header("🏛️ Juzgados × Ciudad — Carga y Desviación (Global)")
+if "juzgados" not in resumenes:
+    st.warning("⚠️ El inventario no tiene columnas de CIUDAD y JUZGADO.")
+    st.stop()
+
+resumen = resumenes["juzgados"]
+col_ciudad, col_juzgado = resumen.columns[:2]
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("🏛️ Juzgados", f"{len(resumen):,}")
+c2.metric("🌆 Ciudades", f"{resumen[col_ciudad].nunique():,}")
+c3.metric("⏱️ P90 días de exceso (mediana entre juzgados)", f"{resumen['DIAS_EXCESO_P90'].median():,.0f}")
+c4.metric("🔴 Juzgados con más de 50 % GRAVE", f"{(resumen['% GRAVE'] > 50).sum():,}")
+
+st.subheader("📈 Carga vs días de exceso (P90)")
+st.caption("Cada punto es un juzgado: tamaño = capital, color = % de procesos GRAVE. Percentiles sobre procesos con SLA.")
+st.plotly_chart(dispersion_juzgados(resumen, col_ciudad, col_juzgado), use_container_width=True)
+
+
+# Fragmento: filtrar ciudades solo vuelve a ejecutar la tabla y su descarga
+@st.fragment
+def tabla_juzgados(resumen: pd.DataFrame):
+    ciudades = st.multiselect(
+        "🔍 Filtrar por Ciudad:", options=sorted(resumen[col_ciudad].dropna().astype(str).unique()), default=[]
+    )
+    filtrado = resumen[resumen[col_ciudad].astype(str).isin(ciudades)] if ciudades else resumen
+
+    cols_dias = [c for c in filtrado.columns if c.startswith("DIAS_EXCESO_")]
+    cols_desv = [c for c in filtrado.columns if c.startswith("PORC_DESVIACION_")]
+    st.dataframe(
+        filtrado.style.background_gradient(subset=["% GRAVE"], cmap="Reds")
+        .format({"CAPITAL_M": "{:,.1f}", "% GRAVE": "{:.1f} %",
+                 **{c: "{:,.0f}" for c in cols_dias}, **{c: "{:.1f} %" for c in cols_desv}}, na_rep="—"),
+        use_container_width=True, height=500
+    )
+
+    # Sin filtro se sirve el libro precalculado; con filtro se arma solo el subconjunto
+    if ciudades:
+        out9 = BytesIO()
+        filtrado.to_excel(out9, index=False, sheet_name="Juzgados_Ciudad", engine="openpyxl")
+        datos_libro = out9.getvalue()
+    else:
+        datos_libro = archivo_descarga(dataset, LIBRO_JUZGADOS)
+    st.download_button(
+        "⬇️ Descargar análisis de Juzgados (según filtro)",
+        data=datos_libro, file_name=LIBRO_JUZGADOS,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+st.subheader("📋 Procesos, capital y percentiles por Juzgado")
+tabla_juzgados(resumen)
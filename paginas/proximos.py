@@ -0,0 +1,116 @@
+# ============================================
+# 📊 Próximos a Vencer (Global) + Resumen por Subetapa 
+# ============================================
+
+import pandas as pd
+import streamlit as st
+from io import BytesIO
+
+from datos import obtener_dataset
+from pronostico import pronosticar_desviacion
+from resumenes import calcular_proximos, resumen_proximos_subetapa
+
+df_all = obtener_dataset()["df_all"]
+
+
+# Fragmento: el filtro de subetapas solo vuelve a ejecutar la tabla y su descarga
+@st.fragment
+def tabla_proximos(proximos: pd.DataFrame, resumen_subetapa: pd.DataFrame):
+    subetapas_unicas = sorted(proximos["SUB_ETAPA_JURIDICA"].dropna().unique())
+    filtro_subetapas = st.multiselect(
+        "🔍 Filtrar por Subetapa Jurídica:",
+        options=subetapas_unicas, default=[],
+        help="Selecciona una o varias subetapas para filtrar la tabla. Si no seleccionas ninguna, se mostrarán todas."
+    )
+    if filtro_subetapas:
+        proximos_filtrados = proximos[proximos["SUB_ETAPA_JURIDICA"].isin(filtro_subetapas)]
+    else:
+        proximos_filtrados = proximos.copy()
+
+    columnas_mostrar = ["DEUDOR", "OPERACION", "ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA",
+                        "DIAS_RESTANTES", "FECHA_LIMITE", "CAPITAL_ACT"]
+    if "CIUDAD" in proximos.columns: columnas_mostrar.append("CIUDAD")
+    if "JUZGADO" in proximos.columns: columnas_mostrar.append("JUZGADO")
+
+    st.dataframe(
+        proximos_filtrados[columnas_mostrar].sort_values("DIAS_RESTANTES")
+        .style.background_gradient(subset=["DIAS_RESTANTES"], cmap="YlOrRd_r")
+        .format({
+            "CAPITAL_ACT": "${:,.0f}",
+            "DIAS_RESTANTES": "{:.0f} días",
+            "FECHA_LIMITE": lambda x: x.strftime("%Y-%m-%d") if pd.notnull(x) else ""
+        }),
+        use_container_width=True, height=550
+    )
+
+    out8 = BytesIO()
+    with pd.ExcelWriter(out8, engine="openpyxl") as writer:
+        proximos_filtrados.to_excel(writer, index=False, sheet_name="Proximos_a_Vencer")
+        if len(proximos) > 0:
+            resumen_subetapa.to_excel(writer, index=False, sheet_name="Resumen_Subetapa")
+    out8.seek(0)
+    st.download_button(
+        "⬇️ Descargar Próximos a Vencer (según filtro)",
+        data=out8, file_name="Proximos_a_Vencer_Filtrado.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+# Fragmento: mover el horizonte solo recalcula la proyección
+@st.fragment
+def pronostico_meses(df_all: pd.DataFrame):
+    horizonte = st.slider("Meses a proyectar", min_value=1, max_value=12, value=6)
+    pronostico = pronosticar_desviacion(df_all, meses=horizonte)
+
+    st.dataframe(
+        pronostico.style.background_gradient(subset=[("CAPITAL_M", "GRAVE")], cmap="Reds")
+        .format("{:,}", subset=["PROCESOS"]).format("{:,.1f}", subset=["CAPITAL_M"]),
+        use_container_width=True, height=min(80 + 35 * horizonte, 480)
+    )
+
+    out_pron = BytesIO()
+    pronostico.to_excel(out_pron, sheet_name="Pronostico_Desviacion", engine="openpyxl")
+    out_pron.seek(0)
+    st.download_button(
+        "⬇️ Descargar Pronóstico",
+        data=out_pron, file_name="Pronostico_Desviacion_Global.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+df8, proximos = calcular_proximos(df_all)
+if proximos is not None:
+    procesos_totales = len(df8)
+    clientes_totales = df8["DEUDOR"].nunique()
+    capital_riesgo = proximos["CAPITAL_MILLONES"].sum()
+    procesos_riesgo = len(proximos)
+
+    st.header("📊 Próximos a Vencer (Riesgo del Mes Actual) — Global")
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("📁 Procesos totales", f"{procesos_totales:,}")
+    c2.metric("👤 Clientes únicos", f"{clientes_totales:,}")
+    c3.metric("💰 Capital en riesgo", f"${capital_riesgo:,.1f} M")
+    c4.metric("🟠 Procesos próximos a vencer", f"{procesos_riesgo:,}")
+
+    if len(proximos) > 0:
+        st.subheader("📋 Resumen por Subetapa Jurídica (Riesgo del Mes)")
+        resumen_subetapa = resumen_proximos_subetapa(proximos)
+
+        st.dataframe(
+            resumen_subetapa.style.background_gradient(subset=["CAPITAL_M"], cmap="YlOrRd")
+            .format({"CAPITAL_M": "{:,.1f}", "% PROCESOS": "{:.1f} %", "PROCESOS": "{:,}", "CLIENTES": "{:,}"}),
+            use_container_width=True, height=250
+        )
+
+    if len(proximos) == 0:
+        st.info("✅ No hay procesos próximos a vencer este mes.")
+    else:
+        st.subheader("🟠 Procesos próximos a vencer dentro del mes")
+        tabla_proximos(proximos, resumen_subetapa)
+
+# ============================================
+# 📈 Pronóstico de desviación (próximos meses, sin gestión)
+# ============================================
+st.header("📈 Pronóstico de Desviación — Próximos Meses (Global)")
+st.caption("Proyección al cierre de cada mes si ningún proceso cambia de etapa. No incluye procesos SIN SLA.")
+pronostico_meses(df_all)
@@ -0,0 +1,29 @@
+# ============================================
+# 📊 Ranking visual Etapa × Subetapa (Global)
+# ============================================
+
+import streamlit as st
+
+from datos import archivo_descarga, obtener_dataset, obtener_resumenes
+from graficos import heatmap_etapa_subetapa
+from precalculo import LIBRO_RANKING
+
+dataset = obtener_dataset()
+resumen = obtener_resumenes(dataset, "ranking")["etapa_subetapa"]
+
+st.header("📊 Ranking Visual Etapa × Subetapa (Global)")
+st.subheader("🔎 Desviación promedio, procesos y capital (todas las etapas/subetapas)")
+st.dataframe(
+    resumen[["ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA", "PROCESOS", "CAPITAL_M", "PROM_DESV", "NIVEL", "INDICADOR"]]
+    .style.format({"CAPITAL_M": "{:,.1f}", "PROM_DESV": "{:.1f} %", "PROCESOS": "{:,}"}),
+    use_container_width=True, height=600
+)
+
+st.subheader("🌡️ Mapa de calor de desviación Etapa × Subetapa")
+st.plotly_chart(heatmap_etapa_subetapa(resumen), use_container_width=True)
+
+st.download_button(
+    "⬇️ Descargar Ranking",
+    data=archivo_descarga(dataset, LIBRO_RANKING), file_name=LIBRO_RANKING,
+    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+)
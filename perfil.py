@@ -0,0 +1,111 @@
+# ============================================
+# 🧮 Perfil estadístico para los prompts de CHRIS IA
+# Resumen de tamaño acotado del inventario procesado: cada sección tiene un máximo de filas,
+# así el prompt (tokens y latencia) no crece con el inventario. Se arma con los resultados
+# de resumenes_globales; solo las distribuciones por etapa se calculan aquí.
+# ============================================
+
+import numpy as np
+import pandas as pd
+
+from motor import UMBRAL_LEVE
+from resumenes import PERCENTILES, cuantiles_por_grupo, dias_exceso, vista_global
+
+MAX_FILAS = 8
+MAX_CASOS = 10
+# Secciones de resumenes_globales que usa el perfil (Banco no entra)
+SECCIONES_PERFIL = ("clasificacion", "ranking", "juzgados", "proximos")
+
+
+def _general(df5: pd.DataFrame) -> pd.DataFrame:
+    """Totales del inventario; la desviación solo cuenta procesos con SLA (PORC_DESVIACION ya es %)."""
+    con_sla = df5[df5["NIVEL_DESVIACION"] != "SIN SLA"]
+    desv = pd.to_numeric(con_sla["PORC_DESVIACION"], errors="coerce")
+    filas = {
+        "Procesos": f"{len(df5):,}",
+        "Capital total (M)": f"{df5['CAPITAL_MILLONES'].sum():,.1f}",
+        "Procesos con SLA": f"{len(con_sla):,}",
+        "Desviación promedio (con SLA)": f"{desv.mean():.1f} %" if len(desv) else "—",
+        "Desviación mediana (con SLA)": f"{desv.median():.1f} %" if len(desv) else "—",
+        f"Procesos con desviación > {UMBRAL_LEVE} %": f"{(desv > UMBRAL_LEVE).sum():,}",
+        "Días de exceso promedio (con SLA)": f"{dias_exceso(con_sla).mean():.0f}" if len(con_sla) else "—",
+    }
+    return pd.DataFrame({"INDICADOR": list(filas), "VALOR": list(filas.values())})
+
+
+def _distribucion_etapas(df5: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Por ETAPA_JURIDICA: procesos, capital y percentiles de desviación y días de exceso (con SLA)."""
+    codigos, etapas = pd.factorize(df5["ETAPA_JURIDICA"], sort=True)
+    validos = codigos >= 0
+    codigos = codigos[validos]
+    con_sla = (df5["NIVEL_DESVIACION"] != "SIN SLA").to_numpy()[validos]
+    n_etapas = len(etapas)
+
+    dist = pd.DataFrame({
+        "ETAPA_JURIDICA": etapas,
+        "PROCESOS": np.bincount(codigos, minlength=n_etapas),
+        "CAPITAL_M": np.bincount(codigos, weights=df5["CAPITAL_MILLONES"].to_numpy()[validos],
+                                 minlength=n_etapas).round(1),
+    })
+    etiquetas = [f"P{round(q * 100)}" for q in PERCENTILES]
+    for col, valores in (("DESV", df5["PORC_DESVIACION"]), ("DIAS_EXCESO", dias_exceso(df5))):
+        valores = pd.to_numeric(valores, errors="coerce").to_numpy(dtype=float)[validos]
+        cuantiles = cuantiles_por_grupo(codigos, np.where(con_sla, valores, np.nan), n_etapas)
+        for j, etiqueta in enumerate(etiquetas):
+            dist[f"{col}_{etiqueta}"] = cuantiles[:, j].round(1)
+    return dist.sort_values(["PROCESOS", "CAPITAL_M"], ascending=False).head(n).reset_index(drop=True)
+
+
+def perfil_estadistico(df_all: pd.DataFrame, resumenes: dict, n: int = MAX_FILAS) -> dict:
+    """
+    Secciones (nombre → DataFrame de a lo sumo `n` filas, salvo casos_extremos con MAX_CASOS):
+    general, estado, capital_riesgo, etapas, subetapas, juzgados, proximos y casos_extremos.
+    Las secciones sin datos en el inventario (p. ej. sin JUZGADO) se omiten.
+    """
+    df5 = vista_global(df_all)
+    perfil = {
+        "general": _general(df5),
+        "estado": resumenes["estado"],
+        "capital_riesgo": resumenes["gravedad"],
+    }
+    if "ETAPA_JURIDICA" in df5.columns:
+        perfil["etapas"] = _distribucion_etapas(df5, n)
+    if not resumenes["etapa_subetapa"].empty:
+        perfil["subetapas"] = (
+            resumenes["etapa_subetapa"].drop(columns=["INDICADOR"]).head(n)
+        )
+    if "juzgados" in resumenes:
+        juzgados = resumenes["juzgados"]
+        perfil["juzgados"] = juzgados[
+            list(juzgados.columns[:2]) + ["PROCESOS", "CAPITAL_M", "% GRAVE", "DIAS_EXCESO_P90", "PORC_DESVIACION_P90"]
+        ].head(n).round(1)
+    if "proximos_subetapa" in resumenes:
+        proximos = resumenes["proximos_subetapa"]
+        total = resumenes["proximos_total"].assign(SUB_ETAPA_JURIDICA="TOTAL", **{"% PROCESOS": 100.0})
+        perfil["proximos"] = pd.concat([proximos.head(n), total], ignore_index=True).round(1)
+
+    casos = [c for c in ("OPERACION", "ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA", "PORC_DESVIACION") if c in df5.columns]
+    if "PORC_DESVIACION" in casos:
+        perfil["casos_extremos"] = df5.nlargest(MAX_CASOS, "PORC_DESVIACION")[casos].round(1)
+    return perfil
+
+
+TITULOS = {
+    "general": "Indicadores generales",
+    "estado": "Procesos y capital (M) por estado de tiempo",
+    "capital_riesgo": "Capital en riesgo (M) por nivel de desviación (procesos fuera de tiempo)",
+    "etapas": "Distribución por etapa: desviación (%) y días de exceso, percentiles sobre procesos con SLA",
+    "subetapas": "Etapa × Subetapa con mayor desviación promedio (%)",
+    "juzgados": "Juzgados con más procesos (% GRAVE y P90 sobre procesos con SLA)",
+    "proximos": "Próximos a vencer este mes por subetapa",
+    "casos_extremos": "Procesos con mayor desviación (%)",
+}
+
+
+def perfil_markdown(perfil: dict, secciones=None) -> str:
+    """Texto markdown del perfil (todas las secciones o solo `secciones`, en ese orden)."""
+    bloques = []
+    for nombre in secciones or TITULOS:
+        if nombre in perfil:
+            bloques.append(f"**{TITULOS[nombre]}**\n\n{perfil[nombre].to_markdown(index=False)}")
+    return "\n\n".join(bloques)
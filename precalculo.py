@@ -0,0 +1,201 @@
+# ============================================
+# 🧊 Precálculo en disco por hash de contenido
+# El vigilante (vigilante.py) procesa cada inventario nuevo y deja aquí dataset, resúmenes
+# y archivos de descarga (Excel, Parquet, Arrow); la app los toma por hash y abre ya caliente.
+#
+#   <CACHE_DIR>/<sha256>[-dedup]/manifiesto.json   (se escribe al final: marca de completo)
+#                                 inventario.pkl, errores.pkl, df_all.pkl, resumenes.pkl
+#                                 un archivo por cada entrada de ARCHIVOS (Excel, Parquet, Arrow)
+#
+# Lo que depende de la fecha de hoy (RESUMENES_DEL_DIA, ARCHIVOS_DEL_DIA) no se guarda:
+# una entrada se puede abrir semanas después y la app lo calcula con la fecha del momento.
+# ============================================
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from io import BytesIO
+
+import pandas as pd
+
+from exportar import arrow_bytes, parquet_bytes, parquet_particionado_zip, resumenes_arrow_zip, resumenes_parquet_zip
+from motor import leer_excel_normalizado, procesar_inventario
+from riesgo import NIVEL_CRITICO, metricas_clientes
+from resumenes import RESUMENES_DEL_DIA, SECCION_DEL_DIA, SECCIONES_FIJAS, resumenes_fijos, vista_global
+from subetapas import cargar_alias, firma_alias
+from validacion import escribir_errores_xlsx
+
+CACHE_DIR = os.environ.get("DESVIACION_CACHE", ".cache_inventarios")
+MANIFIESTO = "manifiesto.json"
+FRAMES = ("inventario", "errores", "df_all")
+LIBRO_ERRORES = "Errores_Validacion_Paso4.xlsx"
+LIBRO_CLASIFICADO = "Inventario_Paso5_Clasificado_Global.xlsx"
+PARQUET_CLASIFICADO = "Inventario_Paso5_Clasificado_Global.parquet"
+PARQUET_PARTICIONADO = "Inventario_Paso5_Clasificado_Global_por_etapa_mes.zip"
+ARROW_CLASIFICADO = "Inventario_Paso5_Clasificado_Global.arrow"
+PARQUET_RESUMENES = "Resumenes_Globales_parquet.zip"
+ARROW_RESUMENES = "Resumenes_Globales_arrow.zip"
+LIBRO_RANKING = "Ranking_Visual_Paso6_Global.xlsx"
+LIBRO_CLIENTES = "Clientes_Graves_Paso7_Global.xlsx"
+LIBRO_JUZGADOS = "Juzgados_Ciudad_Global.xlsx"
+LIBRO_BANCO = "Procesos_Banco_Resumen.xlsx"
+
+
+def hash_contenido(contenido: bytes) -> str:
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def clave_dataset(hash_inv: str, deduplicar: bool = False) -> str:
+    """Nombre de la entrada: el hash del archivo, con sufijo si se deduplicó por OPERACION."""
+    return hash_inv + ("-dedup" if deduplicar else "")
+
+
+def _libro_errores(errores: pd.DataFrame, df_all: pd.DataFrame, resumenes: dict) -> bytes:
+    salida = BytesIO()
+    escribir_errores_xlsx(errores, salida)
+    return salida.getvalue()
+
+
+def _libro_clasificado(errores: pd.DataFrame, df_all: pd.DataFrame, resumenes: dict) -> bytes:
+    salida = BytesIO()
+    vista_global(df_all).to_excel(salida, index=False, engine="xlsxwriter")
+    return salida.getvalue()
+
+
+def _libro(hojas: dict) -> bytes:
+    """Libro con una hoja por DataFrame (hoja → df); un resumen ausente queda como hoja vacía."""
+    salida = BytesIO()
+    with pd.ExcelWriter(salida, engine="xlsxwriter") as writer:
+        for hoja, df in hojas.items():
+            (pd.DataFrame() if df is None else df).to_excel(writer, index=False, sheet_name=hoja)
+    return salida.getvalue()
+
+
+def _libro_clientes(errores: pd.DataFrame, df_all: pd.DataFrame, resumenes: dict) -> bytes:
+    metricas = metricas_clientes(vista_global(df_all))
+    return _libro({"Clientes_Graves": metricas[metricas["NIVEL"] == NIVEL_CRITICO]})
+
+
+# Archivos de descarga: nombre → generador(errores, df_all, resumenes) -> bytes
+ARCHIVOS = {
+    LIBRO_ERRORES: _libro_errores,
+    LIBRO_CLASIFICADO: _libro_clasificado,
+    PARQUET_CLASIFICADO: lambda errores, df_all, resumenes: parquet_bytes(vista_global(df_all)),
+    PARQUET_PARTICIONADO: lambda errores, df_all, resumenes: parquet_particionado_zip(vista_global(df_all)),
+    ARROW_CLASIFICADO: lambda errores, df_all, resumenes: arrow_bytes(vista_global(df_all)),
+    PARQUET_RESUMENES: lambda errores, df_all, resumenes: resumenes_parquet_zip(resumenes),
+    ARROW_RESUMENES: lambda errores, df_all, resumenes: resumenes_arrow_zip(resumenes),
+    LIBRO_RANKING: lambda errores, df_all, resumenes: _libro({"Ranking_Visual_Global": resumenes.get("etapa_subetapa")}),
+    LIBRO_CLIENTES: _libro_clientes,
+    LIBRO_JUZGADOS: lambda errores, df_all, resumenes: _libro({"Juzgados_Ciudad": resumenes.get("juzgados")}),
+    LIBRO_BANCO: lambda errores, df_all, resumenes: _libro({
+        "Resumen_Mensual": resumenes.get("banco_mensual"),
+        "Resumen_Subetapa_Mensual": resumenes.get("banco_subetapa_mensual"),
+    }),
+}
+# Incluyen RESUMENES_DEL_DIA: no se precalculan
+ARCHIVOS_DEL_DIA = {PARQUET_RESUMENES, ARROW_RESUMENES}
+# Secciones de resúmenes que usa cada archivo (los que no aparecen no usan ninguna)
+SECCIONES_ARCHIVO = {
+    PARQUET_RESUMENES: (*SECCIONES_FIJAS, SECCION_DEL_DIA),
+    ARROW_RESUMENES: (*SECCIONES_FIJAS, SECCION_DEL_DIA),
+    LIBRO_RANKING: ("ranking",),
+    LIBRO_JUZGADOS: ("juzgados",),
+    LIBRO_BANCO: ("banco",),
+}
+
+
+def generar_archivo(nombre: str, errores: pd.DataFrame, df_all: pd.DataFrame, resumenes: dict) -> bytes:
+    return ARCHIVOS[nombre](errores, df_all, resumenes)
+
+
+def precalcular(contenido: bytes, tiempos: pd.DataFrame, indice: dict,
+                deduplicar: bool = False, raiz: str = CACHE_DIR) -> str:
+    """
+    Procesa el inventario (Pasos 1–5), calcula resúmenes fijos y ARCHIVOS, y los guarda bajo su hash.
+    Escribe en un directorio temporal y lo renombra al final: la app nunca ve una entrada a medias.
+    Si algo falla, el temporal se borra antes de propagar el error.
+    """
+    clave = clave_dataset(hash_contenido(contenido), deduplicar)
+    destino = os.path.join(raiz, clave)
+    temporal = f"{destino}.tmp-{os.getpid()}"
+    os.makedirs(temporal, exist_ok=True)
+
+    try:
+        firma = firma_alias()
+        inv = leer_excel_normalizado(BytesIO(contenido))
+        inv, errores, df_all = procesar_inventario(inv, tiempos, cargar_alias(), indice, deduplicar=deduplicar)
+        for nombre, df in zip(FRAMES, (inv, errores, df_all)):
+            df.to_pickle(os.path.join(temporal, f"{nombre}.pkl"))
+        resumenes = resumenes_fijos(df_all)
+        pd.to_pickle(resumenes, os.path.join(temporal, "resumenes.pkl"))
+
+        for nombre in ARCHIVOS.keys() - ARCHIVOS_DEL_DIA:
+            with open(os.path.join(temporal, nombre), "wb") as f:
+                f.write(generar_archivo(nombre, errores, df_all, resumenes))
+
+        with open(os.path.join(temporal, MANIFIESTO), "w", encoding="utf-8") as f:
+            json.dump({
+                "clave": clave, "firma_alias": firma, "deduplicar": deduplicar,
+                "procesos": len(df_all), "errores": len(errores),
+                "generado": datetime.now().isoformat(timespec="seconds"),
+            }, f, ensure_ascii=False, indent=2)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporal, destino)
+    return destino
+
+
+def leer_manifiesto(clave: str, raiz: str = CACHE_DIR) -> dict | None:
+    try:
+        with open(os.path.join(raiz, clave, MANIFIESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def cargar_precalculado(clave: str, firma: str, raiz: str = CACHE_DIR) -> dict | None:
+    """
+    Entrada completa y vigente (misma firma de alias) o None si hay que procesar.
+    `resumenes` trae solo los fijos; los del día los agrega quien los usa.
+    """
+    manifiesto = leer_manifiesto(clave, raiz)
+    if manifiesto is None or manifiesto.get("firma_alias") != firma:
+        return None
+    ruta = os.path.join(raiz, clave)
+    try:
+        datos = {nombre: pd.read_pickle(os.path.join(ruta, f"{nombre}.pkl")) for nombre in FRAMES}
+        resumenes = pd.read_pickle(os.path.join(ruta, "resumenes.pkl"))
+    except (OSError, EOFError, ValueError):
+        return None
+    # Entradas anteriores guardaban también los resúmenes del día en que se generaron
+    datos["resumenes"] = {k: v for k, v in resumenes.items() if k not in RESUMENES_DEL_DIA}
+    datos["ruta"] = ruta
+    return datos
+
+
+def leer_archivo(ruta: str | None, nombre: str) -> bytes | None:
+    if not ruta:
+        return None
+    try:
+        with open(os.path.join(ruta, nombre), "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def podar(conservar: int, raiz: str = CACHE_DIR) -> list:
+    """Borra las entradas más antiguas dejando `conservar`; devuelve las borradas."""
+    entradas = [
+        os.path.join(raiz, d) for d in os.listdir(raiz)
+        if os.path.isfile(os.path.join(raiz, d, MANIFIESTO))
+    ] if os.path.isdir(raiz) else []
+    entradas.sort(key=lambda d: os.path.getmtime(os.path.join(d, MANIFIESTO)), reverse=True)
+    for d in entradas[conservar:]:
+        shutil.rmtree(d, ignore_errors=True)
+    return entradas[conservar:]
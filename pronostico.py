@@ -0,0 +1,72 @@
+# ============================================
+# 📈 Pronóstico de desviación a N meses
+# Proyecta VAR_FECHA_CALCULADA al cierre de cada mes sin mover ningún proceso
+# ============================================
+
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from motor import (
+    MESES_ES, NIVELES_DESVIACION, COD_SIN_SLA,
+    clasificar_desviacion, sin_sla_mask,
+)
+
+NIVELES_PRONOSTICO = NIVELES_DESVIACION[:COD_SIN_SLA]  # A TIEMPO, LEVE, MODERADA, GRAVE
+
+
+def horizonte_fin_mes(meses: int, hoy: datetime | None = None) -> pd.DatetimeIndex:
+    """Cierres de mes desde el mes actual (incluido) hasta `meses` meses."""
+    hoy = pd.Timestamp(hoy or datetime.now())
+    return pd.date_range(hoy.to_period("M").to_timestamp(), periods=meses, freq="ME")
+
+
+def _numerico(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+def pronosticar_desviacion(df: pd.DataFrame, meses: int = 6, hoy: datetime | None = None) -> pd.DataFrame:
+    """
+    Matriz mes × nivel con PROCESOS y CAPITAL_M proyectados.
+
+    Se calcula en una sola pasada con broadcasting (n procesos × H meses):
+    la variación proyectada es VAR_FECHA_CALCULADA + días desde FECHA_ACT_INVENTARIO
+    hasta cada cierre de mes, clasificada con los mismos umbrales que ensure_metrics_all.
+    Los procesos SIN SLA no se proyectan.
+    """
+    cierres = horizonte_fin_mes(meses, hoy)
+    h = len(cierres)
+
+    dias = _numerico(df, "DIAS_POR_ETAPA")
+    var = _numerico(df, "VAR_FECHA_CALCULADA")
+    capital = _numerico(df, "CAPITAL_ACT")
+
+    sin_sla = sin_sla_mask(df.get("ETAPA_JURIDICA", pd.Series("", index=df.index)),
+                           df.get("SUB_ETAPA_JURIDICA", pd.Series("", index=df.index)))
+
+    fecha_inv = pd.to_datetime(df.get("FECHA_ACT_INVENTARIO", pd.Series(pd.NaT, index=df.index)), errors="coerce")
+    fecha_inv = fecha_inv.dt.normalize().to_numpy(dtype="datetime64[D]")
+    # (n, 1) contra (1, H): días transcurridos hasta cada cierre, nunca negativos
+    transcurridos = (cierres.to_numpy(dtype="datetime64[D]")[None, :] - fecha_inv[:, None]).astype(float)
+    transcurridos = np.nan_to_num(np.maximum(transcurridos, 0), nan=0.0)
+
+    _, codigo = clasificar_desviacion(dias[:, None], var[:, None] + transcurridos, sin_sla[:, None])
+
+    k = len(NIVELES_PRONOSTICO)
+    valido = codigo != COD_SIN_SLA
+    celda = (np.arange(h)[None, :] * k + codigo)[valido]
+    procesos = np.bincount(celda, minlength=h * k).reshape(h, k)
+    capital_m = np.bincount(
+        celda, weights=np.broadcast_to(capital[:, None], codigo.shape)[valido], minlength=h * k
+    ).reshape(h, k) / 1_000_000
+
+    etiquetas = pd.Index([f"{MESES_ES[c.month]} {c.year}" for c in cierres], name="MES")
+    return pd.concat(
+        {
+            "PROCESOS": pd.DataFrame(procesos, index=etiquetas, columns=NIVELES_PRONOSTICO),
+            "CAPITAL_M": pd.DataFrame(capital_m, index=etiquetas, columns=NIVELES_PRONOSTICO),
+        },
+        axis=1,
+    )
@@ -0,0 +1,384 @@
+# ============================================
+# 📋 Resúmenes globales (Pasos 5–8) sin UI
+# Los usan las páginas de Streamlit y el servicio API
+# ============================================
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from motor import MESES_ES
+
+COLS_PROXIMOS = {"DEUDOR", "OPERACION", "ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA",
+                 "CAPITAL_ACT", "DIAS_POR_ETAPA", "VAR_FECHA_CALCULADA", "FECHA_ACT_INVENTARIO"}
+RIESGO_PROXIMO = "🟠 Próximo a vencer"
+PERCENTILES = (0.50, 0.90, 0.99)
+SIN_MES = "SIN MES"
+TIPO_MES = pd.CategoricalDtype(list(MESES_ES.values()) + [SIN_MES], ordered=True)
+ETIQUETA_TOTAL = "TOTAL"
+
+
+def vista_global(df_all: pd.DataFrame) -> pd.DataFrame:
+    """Copia de df_all con encabezados en mayúscula y CAPITAL_MILLONES (base de Pasos 5–7)."""
+    df = df_all.copy()
+    df.columns = [c.upper().replace("-", "_").replace(" ", "_") for c in df.columns]
+    df["CAPITAL_MILLONES"] = pd.to_numeric(df.get("CAPITAL_ACT", 0), errors="coerce").fillna(0) / 1_000_000
+    return df
+
+
+def dias_exceso(df: pd.DataFrame) -> pd.Series:
+    """max(VAR_FECHA_CALCULADA − DIAS_POR_ETAPA, 0); 0 si falta alguno de los dos."""
+    var = pd.to_numeric(df["VAR_FECHA_CALCULADA"], errors="coerce")
+    dias = pd.to_numeric(df["DIAS_POR_ETAPA"], errors="coerce")
+    return (var - dias).clip(lower=0).fillna(0)
+
+
+def columna_con(df: pd.DataFrame, texto: str) -> str | None:
+    """Primera columna cuyo nombre contiene `texto` (p. ej. "JUZG" → JUZGADO_ORIGEN)."""
+    return next((c for c in df.columns if texto in c), None)
+
+
+# ============================================
+# 🧮 Rollup (grouping sets jerárquicos)
+# ============================================
+def mes_ordenado(meses: pd.Series) -> pd.Series:
+    """
+    Número (1–12, también como texto "3" / "03"), nombre o abreviatura ("MAR") de mes →
+    categórico ordenado Enero…Diciembre. Lo que no se reconoce queda en SIN_MES, al final,
+    para que el rollup no pierda esas filas.
+    """
+    numeros = pd.to_numeric(meses, errors="coerce")
+    por_numero = numeros.map(MESES_ES)
+    por_prefijo = {nombre[:3].upper(): nombre for nombre in MESES_ES.values()}
+    por_nombre = meses.astype("string").str.strip().str[:3].str.upper().map(por_prefijo)
+    return por_numero.fillna(por_nombre).fillna(SIN_MES).astype(TIPO_MES)
+
+
+def rollup(df: pd.DataFrame, niveles: list, agregaciones: dict, etiqueta_total: str = ETIQUETA_TOTAL) -> pd.DataFrame:
+    """
+    GROUP BY ROLLUP(niveles): una fila por grupo de cada prefijo de `niveles` (del más fino al
+    total general). `agregaciones` = {salida: (columna, "sum" | "count" | "nunique")}.
+
+    Las filas crudas se recorren una sola vez: sumas y conteos de los niveles superiores salen
+    de re-sumar el nivel más fino; los distintos ("nunique") salen de los pares (grupo, valor)
+    ya deduplicados. La columna AGRUPACION indica cuántos niveles tiene la fila (0 = total);
+    los niveles colapsados quedan en "" y el primero en `etiqueta_total`. Conserva el orden
+    de categóricos (p. ej. mes_ordenado) al ordenar.
+    """
+    aditivas = {k: v for k, v in agregaciones.items() if v[1] in ("sum", "count")}
+    distintas = {k: v for k, v in agregaciones.items() if v[1] == "nunique"}
+
+    fino = df.groupby(niveles, observed=True, sort=False).agg(**aditivas) if aditivas else None
+    pares = {
+        col: df[niveles + [col]].dropna().drop_duplicates()
+        for col in {c for c, _ in distintas.values()}
+    }
+
+    partes = []
+    for k in range(len(niveles), -1, -1):
+        claves = niveles[:k]
+        if k == 0:
+            parte = pd.DataFrame(index=[0])
+            if fino is not None:
+                parte = fino.sum().to_frame().T.astype(fino.dtypes)
+            for salida, (col, _) in distintas.items():
+                parte[salida] = pares[col][col].nunique()
+        else:
+            parte = (fino.groupby(level=claves, observed=True).sum() if fino is not None
+                     else pares[next(iter(pares))][claves].drop_duplicates().set_index(claves))
+            for salida, (col, _) in distintas.items():
+                parte[salida] = pares[col].drop_duplicates(claves + [col]).groupby(claves, observed=True).size()
+            parte = parte.sort_index().reset_index()
+        parte = parte[claves + list(agregaciones)]
+        parte.insert(0, "AGRUPACION", k)
+        partes.append(parte)
+
+    resultado = pd.concat([p.astype({c: object for c in niveles if c in p}) for p in partes], ignore_index=True)
+    resultado[niveles] = resultado[niveles].fillna("")
+    resultado.loc[resultado["AGRUPACION"] == 0, niveles[0]] = etiqueta_total
+    return resultado
+
+
+# ============================================
+# 📊 Paso 5 — Estado, gravedad y rankings
+# ============================================
+def resumen_estado(df5: pd.DataFrame) -> pd.DataFrame:
+    resumen = df5.groupby("ESTADO_TIEMPO").agg(
+        PROCESOS=("ESTADO_TIEMPO", "count"),
+        CAPITAL=("CAPITAL_MILLONES", "sum")
+    ).reset_index()
+    resumen["% DEL TOTAL"] = (resumen["PROCESOS"] / max(len(df5), 1) * 100).round(1)
+    return resumen
+
+
+def resumen_gravedad(df5: pd.DataFrame) -> pd.DataFrame:
+    """LEVE/MODERADA/GRAVE de los procesos FUERA DE TIEMPO (vacío si no hay desviados)."""
+    desviados_df = df5[df5["ESTADO_TIEMPO"] == "FUERA DE TIEMPO"]
+    if desviados_df.empty:
+        return pd.DataFrame(columns=["PROCESOS", "CAPITAL", "% CAPITAL DESVIADO"])
+    gravedad = desviados_df.groupby("NIVEL_DESVIACION").agg(
+        PROCESOS=("NIVEL_DESVIACION", "count"), CAPITAL=("CAPITAL_MILLONES", "sum")
+    ).reindex(["LEVE", "MODERADA", "GRAVE"]).fillna(0)
+    gravedad["% CAPITAL DESVIADO"] = (gravedad["CAPITAL"] / max(gravedad["CAPITAL"].sum(), 1) * 100).round(1)
+    return gravedad
+
+
+def resumen_nivel(df5: pd.DataFrame) -> pd.DataFrame:
+    return df5.groupby("NIVEL_DESVIACION").agg(
+        PROCESOS=("NIVEL_DESVIACION", "count"), CAPITAL=("CAPITAL_MILLONES", "sum")
+    ).reset_index()
+
+
+def ranking_por(df5: pd.DataFrame, col: str, orden: str) -> pd.DataFrame:
+    """Ranking por ETAPA_JURIDICA o SUB_ETAPA_JURIDICA, ordenado por `orden` descendente."""
+    rank = df5.groupby(col).agg(
+        PROCESOS=("DEUDOR", "count"), CAPITAL=("CAPITAL_MILLONES", "sum"),
+        PROM_DESV=("PORC_DESVIACION", "mean")
+    ).reset_index().sort_values(orden, ascending=False)
+    rank["PROM_DESV"] = rank["PROM_DESV"].round(1)
+    return rank
+
+
+# ============================================
+# 📊 Paso 6 — Ranking visual Etapa × Subetapa
+# ============================================
+def nivel(p):
+    if p == 0: return "A TIEMPO"
+    return "🟢 Leve" if p <= 30 else ("🟡 Moderada" if p <= 70 else "🔴 Grave")
+
+
+def ranking_etapa_subetapa(df6: pd.DataFrame) -> pd.DataFrame:
+    resumen = df6.groupby(["ETAPA_JURIDICA", "SUB_ETAPA_JURIDICA"]).agg(
+        PROCESOS=("DEUDOR", "count"),
+        CAPITAL_M=("CAPITAL_MILLONES", "sum"),
+        PROM_DESV=("PORC_DESVIACION", "mean")
+    ).reset_index()
+
+    resumen["PROM_DESV"] = resumen["PROM_DESV"].round(1)
+    resumen["CAPITAL_M"] = resumen["CAPITAL_M"].round(1)
+    resumen["NIVEL"] = resumen["PROM_DESV"].apply(nivel)
+    resumen["INDICADOR"] = resumen["PROM_DESV"].apply(lambda x: "█" * int(min(x/5, 20)) if x>0 else "")
+
+    return resumen.sort_values("PROM_DESV", ascending=False).reset_index(drop=True)
+
+
+# ============================================
+# 📊 Paso 8 — Próximos a vencer (riesgo del mes actual)
+# ============================================
+def calcular_proximos(df_all: pd.DataFrame, hoy: datetime | None = None):
+    """
+    Devuelve (df8, proximos): df8 con DIAS_RESTANTES, FECHA_LIMITE y RIESGO_MES para todo
+    el inventario, y proximos con los que vencen antes del fin del mes de `hoy`.
+    Devuelve (df8, None) si faltan columnas de COLS_PROXIMOS.
+    """
+    df8 = df_all.copy()
+    df8.columns = [c.upper().replace("-", "_").replace(" ", "_") for c in df8.columns]
+    if COLS_PROXIMOS - set(df8.columns):
+        return df8, None
+
+    df8["FECHA_ACT_INVENTARIO"] = pd.to_datetime(df8["FECHA_ACT_INVENTARIO"], errors="coerce")
+    df8["DIAS_POR_ETAPA"] = pd.to_numeric(df8["DIAS_POR_ETAPA"], errors="coerce")
+    df8["VAR_FECHA_CALCULADA"] = pd.to_numeric(df8["VAR_FECHA_CALCULADA"], errors="coerce")
+
+    df8["DIAS_RESTANTES"] = df8["DIAS_POR_ETAPA"] - df8["VAR_FECHA_CALCULADA"]
+    df8["DIAS_RESTANTES"] = df8["DIAS_RESTANTES"].where(df8["DIAS_RESTANTES"] > 0, 0)
+
+    df8["FECHA_LIMITE"] = df8["FECHA_ACT_INVENTARIO"] + pd.to_timedelta(df8["DIAS_RESTANTES"], unit="D")
+
+    hoy = hoy or datetime.now()
+    fin_mes = datetime(hoy.year, hoy.month, 1) + relativedelta(months=1) - relativedelta(days=1)
+    df8["DIAS_FIN_MES"] = (fin_mes - hoy).days
+
+    df8["RIESGO_MES"] = np.where(
+        (df8["DIAS_RESTANTES"] > 0) & (df8["DIAS_RESTANTES"] <= df8["DIAS_FIN_MES"]), RIESGO_PROXIMO, ""
+    )
+
+    proximos = df8[df8["RIESGO_MES"] == RIESGO_PROXIMO].copy()
+    proximos["CAPITAL_MILLONES"] = pd.to_numeric(proximos["CAPITAL_ACT"], errors="coerce").fillna(0) / 1_000_000
+    return df8, proximos
+
+
+def resumen_proximos_subetapa(proximos: pd.DataFrame) -> pd.DataFrame:
+    resumen_subetapa = proximos.groupby("SUB_ETAPA_JURIDICA").agg(
+        PROCESOS=("OPERACION", "count"),
+        CLIENTES=("DEUDOR", "nunique"),
+        CAPITAL_M=("CAPITAL_MILLONES", "sum")
+    ).reset_index()
+    resumen_subetapa["% PROCESOS"] = (
+        resumen_subetapa["PROCESOS"] / max(resumen_subetapa["PROCESOS"].sum(), 1) * 100
+    ).round(1)
+    return resumen_subetapa.sort_values("PROCESOS", ascending=False)
+
+
+# ============================================
+# 🏦 Bloque Banco — procesos SIN SLA por Año × Mes × Subetapa
+# ============================================
+NIVELES_BANCO = ["AÑO_PASE_JURIDICO", "MES_PASE_JURIDICO", "SUB_ETAPA_JURIDICA"]
+AGREGACIONES_BANCO = {
+    "PROCESOS": ("OPERACION", "count"),
+    "CLIENTES": ("DEUDOR", "nunique"),
+    "CAPITAL_M": ("CAPITAL_MILLONES", "sum"),
+}
+
+
+def base_banco(df_all: pd.DataFrame) -> pd.DataFrame:
+    """Procesos SIN SLA con CAPITAL_MILLONES, AÑO_PASE_JURIDICO y MES_PASE_JURIDICO (categórico)."""
+    dfb = df_all[df_all["ESTADO_TIEMPO"].astype(str).str.upper() == "SIN SLA"].copy()
+    dfb["CAPITAL_ACT"] = pd.to_numeric(dfb.get("CAPITAL_ACT", 0), errors="coerce").fillna(0)
+    dfb["CAPITAL_MILLONES"] = dfb["CAPITAL_ACT"] / 1_000_000
+
+    if "AÑO_PASE_JURIDICO" not in dfb.columns or "MES_PASE_JURIDICO" not in dfb.columns:
+        fecha_pase = pd.to_datetime(dfb.get("FECHA_ACT_ETAPA", pd.NaT), errors="coerce")
+        dfb["AÑO_PASE_JURIDICO"] = fecha_pase.dt.year.astype("Int64")
+        dfb["MES_PASE_JURIDICO"] = fecha_pase.dt.month
+    dfb["MES_PASE_JURIDICO"] = mes_ordenado(dfb["MES_PASE_JURIDICO"])
+    return dfb
+
+
+def resumen_banco(dfb: pd.DataFrame) -> tuple:
+    """
+    (resumen_mensual, resumen_sub_mensual) del Bloque Banco, cada uno con su fila TOTAL,
+    a partir de un único rollup Año × Mes × Subetapa.
+    """
+    r = rollup(dfb, NIVELES_BANCO, AGREGACIONES_BANCO)
+    total = r.loc[r["AGRUPACION"] == 0, "PROCESOS"].iloc[0]
+    r["% PROCESOS"] = (r["PROCESOS"] / max(total, 1) * 100).round(1)
+    r["CAPITAL_M"] = r["CAPITAL_M"].round(1)
+
+    def seleccion(agrupacion, columnas):
+        filas = r[r["AGRUPACION"].isin([agrupacion, 0])]
+        return filas[columnas + list(AGREGACIONES_BANCO) + ["% PROCESOS"]].reset_index(drop=True)
+
+    return seleccion(2, NIVELES_BANCO[:2]), seleccion(3, NIVELES_BANCO)
+
+
+# ============================================
+# 🏛️ Juzgado × Ciudad — carga y percentiles de desviación
+# ============================================
+def cuantiles_por_grupo(codigos: np.ndarray, valores: np.ndarray, n_grupos: int,
+                        qs=PERCENTILES) -> np.ndarray:
+    """
+    Cuantiles (interpolación lineal, como pandas) de `valores` por grupo en una sola pasada:
+    un lexsort por (grupo, valor) y lectura por posición. Ignora NaN; grupo vacío → NaN.
+    Devuelve una matriz n_grupos × len(qs).
+    """
+    validos = ~np.isnan(valores)
+    codigos, valores = codigos[validos], valores[validos]
+    orden = np.lexsort((valores, codigos))
+    ordenados = valores[orden]
+
+    n = np.bincount(codigos, minlength=n_grupos)
+    inicio = np.cumsum(n) - n
+    salida = np.full((n_grupos, len(qs)), np.nan)
+    hay = n > 0
+
+    pos = (n[hay, None] - 1) * np.asarray(qs)[None, :]
+    bajo = np.floor(pos).astype(np.intp)
+    alto = np.minimum(bajo + 1, n[hay, None] - 1)
+    base = inicio[hay, None]
+    v_bajo, v_alto = ordenados[base + bajo], ordenados[base + alto]
+    salida[hay] = v_bajo + (v_alto - v_bajo) * (pos - bajo)
+    return salida
+
+
+def resumen_juzgados(df5: pd.DataFrame, col_ciudad: str, col_juzgado: str, qs=PERCENTILES) -> pd.DataFrame:
+    """
+    Por CIUDAD × JUZGADO: procesos, capital, % GRAVE y percentiles de DIAS_EXCESO y
+    PORC_DESVIACION. Los percentiles y el % GRAVE solo cuentan procesos con SLA.
+    """
+    grupos = df5.groupby([col_ciudad, col_juzgado], sort=True, dropna=False)
+    codigos = grupos.ngroup().to_numpy()
+    n_grupos = grupos.ngroups
+
+    con_sla = (df5["NIVEL_DESVIACION"] != "SIN SLA").to_numpy()
+    grave = (df5["NIVEL_DESVIACION"] == "GRAVE").to_numpy()
+    n_sla = np.bincount(codigos, weights=con_sla, minlength=n_grupos)
+
+    resumen = grupos.size().rename("PROCESOS").reset_index()
+    resumen["CON_SLA"] = n_sla.astype(int)
+    resumen["CAPITAL_M"] = np.bincount(codigos, weights=df5["CAPITAL_MILLONES"].to_numpy(), minlength=n_grupos)
+    resumen["% GRAVE"] = (np.bincount(codigos, weights=grave, minlength=n_grupos) / np.maximum(n_sla, 1) * 100).round(1)
+
+    etiquetas = [f"P{round(q * 100)}" for q in qs]
+    for col, valores in (("DIAS_EXCESO", dias_exceso(df5)), ("PORC_DESVIACION", df5["PORC_DESVIACION"])):
+        valores = pd.to_numeric(valores, errors="coerce").to_numpy(dtype=float)
+        cuantiles = cuantiles_por_grupo(codigos, np.where(con_sla, valores, np.nan), n_grupos, qs)
+        for j, etiqueta in enumerate(etiquetas):
+            resumen[f"{col}_{etiqueta}"] = cuantiles[:, j]
+
+    return resumen.sort_values(["PROCESOS", "CAPITAL_M"], ascending=False).reset_index(drop=True)
+
+
+# ============================================
+# 🧾 Todos los resúmenes globales de una vez (API / precálculo)
+# ============================================
+# Dependen de la fecha de hoy: no se guardan en cachés que sobreviven al día
+RESUMENES_DEL_DIA = ("proximos_subetapa", "proximos_total")
+SECCION_DEL_DIA = "proximos"
+
+
+def _seccion_clasificacion(df5: pd.DataFrame, df_all: pd.DataFrame) -> dict:
+    resumenes = {
+        "estado": resumen_estado(df5),
+        "gravedad": resumen_gravedad(df5).reset_index(names="NIVEL_DESVIACION"),
+        "nivel": resumen_nivel(df5),
+    }
+    if "ETAPA_JURIDICA" in df5.columns:
+        resumenes["etapas"] = ranking_por(df5, "ETAPA_JURIDICA", "CAPITAL")
+    if "SUB_ETAPA_JURIDICA" in df5.columns:
+        resumenes["subetapas"] = ranking_por(df5, "SUB_ETAPA_JURIDICA", "PROM_DESV")
+    return resumenes
+
+
+def _seccion_juzgados(df5: pd.DataFrame, df_all: pd.DataFrame) -> dict:
+    col_ciudad, col_juzgado = columna_con(df5, "CIUDAD"), columna_con(df5, "JUZG")
+    if not (col_ciudad and col_juzgado):
+        return {}
+    return {"juzgados": resumen_juzgados(df5, col_ciudad, col_juzgado)}
+
+
+def _seccion_banco(df5: pd.DataFrame, df_all: pd.DataFrame) -> dict:
+    dfb = base_banco(df_all)
+    if dfb.empty:
+        return {}
+    mensual, sub_mensual = resumen_banco(dfb)
+    return {"banco_mensual": mensual, "banco_subetapa_mensual": sub_mensual}
+
+
+# Sección → función(df5, df_all) -> {nombre: resumen}. Cada página pide solo sus secciones
+SECCIONES_FIJAS = {
+    "clasificacion": _seccion_clasificacion,
+    "ranking": lambda df5, df_all: {"etapa_subetapa": ranking_etapa_subetapa(df5)},
+    "juzgados": _seccion_juzgados,
+    "banco": _seccion_banco,
+}
+
+
+def resumenes_fijos(df_all: pd.DataFrame, secciones=None) -> dict:
+    """Resúmenes que solo dependen del inventario (todas las SECCIONES_FIJAS o solo `secciones`)."""
+    df5 = vista_global(df_all)
+    resumenes = {}
+    for nombre in secciones or SECCIONES_FIJAS:
+        resumenes.update(SECCIONES_FIJAS[nombre](df5, df_all))
+    return resumenes
+
+
+def resumenes_del_dia(proximos: pd.DataFrame | None) -> dict:
+    """
+    RESUMENES_DEL_DIA a partir de calcular_proximos (vacío si faltan sus columnas).
+    proximos_total cuenta clientes distintos: un cliente en dos subetapas no suma dos veces.
+    """
+    if proximos is None:
+        return {}
+    total = pd.DataFrame([{
+        "PROCESOS": len(proximos), "CLIENTES": proximos["DEUDOR"].nunique(),
+        "CAPITAL_M": proximos["CAPITAL_MILLONES"].sum(),
+    }])
+    return {"proximos_subetapa": resumen_proximos_subetapa(proximos), "proximos_total": total}
+
+
+def resumenes_globales(df_all: pd.DataFrame, hoy: datetime | None = None) -> dict:
+    _, proximos = calcular_proximos(df_all, hoy)
+    return {**resumenes_fijos(df_all), **resumenes_del_dia(proximos)}
@@ -0,0 +1,113 @@
+# ============================================
+# 🎯 Riesgo por cliente (DEUDOR) — Paso 7
+# Métricas por cliente en una pasada (np.bincount / np.maximum.at sobre códigos de DEUDOR),
+# puntaje configurable y top-K con np.argpartition (sin ordenar a todos los clientes).
+# ============================================
+
+import numpy as np
+import pandas as pd
+
+from motor import UMBRAL_LEVE, UMBRAL_MODERADA
+from resumenes import dias_exceso
+
+# Peso de cada componente del puntaje; cada componente se normaliza a [0, 1] por su P99
+# (los valores extremos de PORC_DESVIACION no aplastan al resto)
+PESOS_SCORE = {"DESV_PONDERADA": 0.5, "DIAS_EXCESO_MAX": 0.3, "OPERACIONES_GRAVES": 0.2}
+PERCENTIL_TOPE = 99
+NIVELES_CLIENTE = ["A TIEMPO", "🟢 Leve", "🟡 Moderada", "🔴 Grave"]
+NIVEL_CRITICO = NIVELES_CLIENTE[3]
+
+
+def nivel_cliente(desviacion) -> np.ndarray:
+    """Mismos cortes que el Paso 7 (0 / ≤30 / ≤70 / >70), vectorizado."""
+    p = np.asarray(desviacion, dtype=float)
+    return np.select(
+        [p == 0, p <= UMBRAL_LEVE, p <= UMBRAL_MODERADA], NIVELES_CLIENTE[:3], NIVELES_CLIENTE[3]
+    )
+
+
+def metricas_clientes(df7: pd.DataFrame) -> pd.DataFrame:
+    """
+    Por DEUDOR: OPERACIONES, CAPITAL_M, PROM_DESV (promedio simple, como antes),
+    DESV_PONDERADA (promedio de PORC_DESVIACION ponderado por capital, solo procesos con SLA),
+    DIAS_EXCESO_PROM, DIAS_EXCESO_MAX (ambos solo procesos con SLA) y OPERACIONES_GRAVES.
+    `df7` es vista_global(df_all) (con CAPITAL_MILLONES).
+    """
+    codigos, deudores = pd.factorize(df7["DEUDOR"], sort=True)
+    validos = codigos >= 0
+    codigos = codigos[validos]
+    n = len(deudores)
+
+    def columna(nombre: str) -> np.ndarray:
+        return pd.to_numeric(df7[nombre], errors="coerce").fillna(0).to_numpy(dtype=float)[validos]
+
+    capital = columna("CAPITAL_MILLONES")
+    desv = columna("PORC_DESVIACION")
+    nivel = df7["NIVEL_DESVIACION"].to_numpy()[validos]
+    con_sla = nivel != "SIN SLA"
+    # Sin SLA no hay plazo contra el cual medir exceso (DIAS_POR_ETAPA 0 o no aplica)
+    exceso = dias_exceso(df7).to_numpy(dtype=float)[validos] * con_sla
+
+    def suma(pesos: np.ndarray) -> np.ndarray:
+        return np.bincount(codigos, weights=pesos, minlength=n)
+
+    operaciones = np.bincount(codigos, minlength=n)
+
+    capital_sla = suma(capital * con_sla)
+    n_sla = suma(con_sla.astype(float))
+    ponderada = np.divide(suma(capital * desv * con_sla), capital_sla,
+                          out=np.zeros(n), where=capital_sla > 0)
+    # Sin capital con SLA: promedio simple de los procesos con SLA
+    simple_sla = np.divide(suma(desv * con_sla), n_sla, out=np.zeros(n), where=n_sla > 0)
+    ponderada = np.where(capital_sla > 0, ponderada, simple_sla)
+
+    exceso_max = np.zeros(n)
+    np.maximum.at(exceso_max, codigos, exceso)
+
+    resumen = pd.DataFrame({
+        "DEUDOR": deudores,
+        "OPERACIONES": operaciones,
+        "CAPITAL_M": suma(capital).round(1),
+        "PROM_DESV": (suma(desv) / operaciones).round(1),
+        "DESV_PONDERADA": ponderada.round(1),
+        "DIAS_EXCESO_PROM": np.divide(suma(exceso), n_sla, out=np.zeros(n), where=n_sla > 0).round(1),
+        "DIAS_EXCESO_MAX": exceso_max,
+        "OPERACIONES_GRAVES": suma((nivel == "GRAVE").astype(float)).astype(int),
+    })
+    resumen["NIVEL"] = nivel_cliente(resumen["DESV_PONDERADA"])
+    return resumen
+
+
+def puntaje_riesgo(metricas: pd.DataFrame, pesos: dict | None = None) -> np.ndarray:
+    """Puntaje 0–100: suma ponderada de los componentes normalizados (valor / P99, tope 1)."""
+    pesos = {k: v for k, v in (pesos or PESOS_SCORE).items() if v > 0}
+    if not pesos:
+        return np.zeros(len(metricas))
+    total = np.zeros(len(metricas))
+    for col, peso in pesos.items():
+        valores = metricas[col].to_numpy(dtype=float)
+        tope = np.percentile(valores, PERCENTIL_TOPE) if len(valores) else 0
+        if tope <= 0:
+            tope = valores.max() if len(valores) else 0
+        if tope > 0:
+            total += peso * np.minimum(valores / tope, 1)
+    return (100 * total / sum(pesos.values())).round(1)
+
+
+def top_criticos(metricas: pd.DataFrame, k: int = 50, pesos: dict | None = None) -> pd.DataFrame:
+    """
+    Los `k` clientes de mayor SCORE; empates de puntaje se desempatan por capital.
+    np.partition da el puntaje de corte en O(n); solo se ordenan los que lo alcanzan
+    (todos los empatados en el corte, para que el desempate por capital decida quién entra).
+    """
+    score = puntaje_riesgo(metricas, pesos)
+    k = min(k, len(metricas))
+    if k <= 0:
+        return metricas.iloc[:0].assign(SCORE=pd.Series(dtype=float))
+    corte = np.partition(score, len(score) - k)[len(score) - k]
+    candidatos = np.flatnonzero(score >= corte)
+    capital = metricas["CAPITAL_M"].to_numpy()[candidatos]
+    orden = candidatos[np.lexsort((-capital, -score[candidatos]))][:k]
+    top = metricas.iloc[orden].copy()
+    top.insert(1, "SCORE", score[orden])
+    return top.reset_index(drop=True)
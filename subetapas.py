@@ -0,0 +1,142 @@
+# ============================================
+# 🔤 Resolución de subetapas contra la tabla de tiempos (SLA)
+# Alias confirmados (archivo local) → dict; coincidencia aproximada solo para los nombres
+# distintos que no cruzan, sobre un índice de tokens precalculado de la tabla de tiempos
+# ============================================
+
+import json
+import os
+import unicodedata
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+ALIAS_PATH = "alias_subetapas.json"  # mapeos confirmados: {"SUBETAPA INVENTARIO": "SUBETAPA TABLA"}
+UMBRAL_SUGERENCIA = 0.6
+UMBRAL_CONFIRMACION = 0.9  # a partir de aquí la sugerencia viene marcada para confirmar
+
+
+def normalizar_texto(texto) -> str:
+    """Mayúsculas, sin tildes, sin signos y con espacios simples."""
+    texto = ''.join(c for c in unicodedata.normalize('NFD', str(texto)) if unicodedata.category(c) != 'Mn')
+    texto = ''.join(c if c.isalnum() else " " for c in texto.upper())
+    return " ".join(texto.split())
+
+
+# ============================================
+# 📁 Alias confirmados
+# ============================================
+def cargar_alias(path: str = ALIAS_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def guardar_alias(nuevos: dict, path: str = ALIAS_PATH) -> dict:
+    """Agrega `nuevos` a los alias existentes y escribe el archivo de forma atómica."""
+    alias = cargar_alias(path)
+    alias.update(nuevos)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(alias.items())), f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    return alias
+
+
+def firma_alias(path: str = ALIAS_PATH) -> str:
+    """Cambia cuando cambia el archivo de alias (sirve como parte de claves de caché)."""
+    return str(os.stat(path).st_mtime_ns) if os.path.exists(path) else ""
+
+
+# ============================================
+# 🗂️ Índice de la tabla de tiempos
+# ============================================
+def construir_indice(nombres) -> dict:
+    """
+    Índice de los nombres de la tabla de tiempos:
+    - exactos: nombres tal cual (JOIN actual)
+    - normalizados: nombre normalizado → nombre original (el primero si se repite)
+    - prefijos: primeras 3 letras de cada token → posiciones, para acotar candidatos
+    """
+    canonicos = list(dict.fromkeys(str(n) for n in nombres if pd.notna(n)))
+    normalizados, prefijos, tokens = {}, {}, []
+    for i, nombre in enumerate(canonicos):
+        norm = normalizar_texto(nombre)
+        normalizados.setdefault(norm, nombre)
+        toks = norm.split()
+        tokens.append((norm, set(toks)))
+        for t in toks:
+            prefijos.setdefault(t[:3], set()).add(i)
+    return {
+        "canonicos": canonicos, "exactos": set(canonicos), "normalizados": normalizados,
+        "prefijos": prefijos, "tokens": tokens, "memo": {},
+    }
+
+
+def _puntaje(norm: str, toks: set, cand_norm: str, cand_toks: set) -> float:
+    """Máximo entre similitud de caracteres y de tokens ordenados, ajustado por abreviaturas."""
+    directo = SequenceMatcher(None, norm, cand_norm).ratio()
+    ordenado = SequenceMatcher(None, " ".join(sorted(toks)), " ".join(sorted(cand_toks))).ratio()
+    # Abreviaturas: "NOTIF" cubre "NOTIFICACION"
+    cubiertos = sum(
+        any(t == c or (min(len(t), len(c)) >= 4 and (c.startswith(t) or t.startswith(c))) for c in cand_toks)
+        for t in toks
+    )
+    cobertura = cubiertos / max(len(toks), len(cand_toks), 1)
+    return max(directo, ordenado, cobertura)
+
+
+def candidatos(nombre: str, indice: dict, top: int = 3) -> list:
+    """Mejores (nombre_tabla, puntaje) para un nombre del inventario. Memoizado por índice."""
+    norm = normalizar_texto(nombre)
+    if norm in indice["memo"]:
+        return indice["memo"][norm][:top]
+
+    toks = set(norm.split())
+    posiciones = set().union(*(indice["prefijos"].get(t[:3], set()) for t in toks)) if toks else set()
+    if not posiciones:
+        posiciones = range(len(indice["canonicos"]))
+
+    puntuados = sorted(
+        ((indice["canonicos"][i], _puntaje(norm, toks, *indice["tokens"][i])) for i in posiciones),
+        key=lambda x: x[1], reverse=True,
+    )
+    indice["memo"][norm] = puntuados
+    return puntuados[:top]
+
+
+# ============================================
+# 🔗 Resolución para el JOIN del Paso 3
+# ============================================
+def resolver_subetapas(valores, indice: dict, alias: dict | None = None) -> dict:
+    """
+    Mapeo valor_inventario → nombre en la tabla de tiempos para los valores distintos.
+    Orden: coincidencia exacta, alias confirmado, igualdad tras normalizar (tildes, espacios,
+    mayúsculas). Los que no resuelven quedan fuera del mapeo (sin SLA) y se pueden sugerir.
+    """
+    alias = alias or {}
+    mapeo = {}
+    for v in pd.unique(pd.Series(valores).dropna()):
+        texto = str(v)
+        if texto in indice["exactos"]:
+            mapeo[v] = texto
+        elif texto in alias:
+            mapeo[v] = alias[texto]
+        elif normalizar_texto(texto) in indice["normalizados"]:
+            mapeo[v] = indice["normalizados"][normalizar_texto(texto)]
+    return mapeo
+
+
+def sugerir_subetapas(no_resueltos, indice: dict, umbral: float = UMBRAL_SUGERENCIA) -> pd.DataFrame:
+    """Sugerencias para los nombres distintos sin SLA (uno por fila, el mejor candidato)."""
+    filas = []
+    for nombre in sorted(set(map(str, no_resueltos))):
+        mejores = candidatos(nombre, indice, top=1)
+        if mejores and mejores[0][1] >= umbral:
+            sugerencia, puntaje = mejores[0]
+            filas.append({
+                "SUB_ETAPA_INVENTARIO": nombre, "SUGERENCIA_TABLA": sugerencia,
+                "PUNTAJE": round(puntaje, 3), "CONFIRMAR": puntaje >= UMBRAL_CONFIRMACION,
+            })
+    return pd.DataFrame(filas, columns=["SUB_ETAPA_INVENTARIO", "SUGERENCIA_TABLA", "PUNTAJE", "CONFIRMAR"])
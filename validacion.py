@@ -0,0 +1,124 @@
+# ============================================
+# 🧪 Paso 4 — Reglas de validación del inventario
+# Registro declarativo: cada regla es una máscara vectorizada y un bit en CODIGO_VALIDACION,
+# así una fila conserva TODAS las reglas que incumple (ninguna pisa a otra).
+# ============================================
+
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from duplicados import COL_DUP_CONFLICTO, COL_VARIOS_DEUDORES, llave_texto
+
+COL_CODIGO, COL_DETALLE = "CODIGO_VALIDACION", "ERRORES_VALIDACION"
+SEPARADOR = " | "
+
+
+class Regla(NamedTuple):
+    nombre: str
+    mascara: Callable[[pd.DataFrame], pd.Series]
+    excluye: bool  # True: la fila no entra a la base limpia (df_all)
+
+
+def _numerica_invalida(inv: pd.DataFrame, col: str) -> pd.Series:
+    if col not in inv.columns:
+        return pd.Series(False, index=inv.index)
+    return inv[col].notna() & pd.to_numeric(inv[col], errors="coerce").isna()
+
+
+def _duplicada(inv: pd.DataFrame, col: str) -> pd.Series:
+    if col not in inv.columns:
+        return pd.Series(False, index=inv.index)
+    llave = llave_texto(inv[col])  # misma llave que el índice de duplicados
+    return llave.notna() & llave.duplicated(keep=False)
+
+
+def _bandera(inv: pd.DataFrame, col: str) -> pd.Series:
+    """Columna booleana precalculada (p. ej. índice de duplicados); False si no existe."""
+    return inv[col].fillna(False).astype(bool) if col in inv.columns else pd.Series(False, index=inv.index)
+
+
+# El orden define el bit: no reordenar, solo agregar al final
+REGLAS_PASO4 = [
+    Regla("FALTA FECHA INVENTARIO", lambda inv: inv["FECHA_ACT_INVENTARIO"].isna(), True),
+    Regla("FALTA FECHA ACT ETAPA", lambda inv: inv["FECHA_ACT_ETAPA"].isna(), True),
+    # Se conserva la fecha reportada; VAR_FECHA_CALCULADA se lleva a 0 (antes se sobrescribía la fecha).
+    # Se compara por día, como VAR_FECHA_CALCULADA: una etapa del mismo día con hora no es inconsistente
+    Regla("ETAPA POSTERIOR AL INVENTARIO (INCONSISTENCIA)",
+          lambda inv: inv["FECHA_ACT_ETAPA"].dt.normalize() > inv["FECHA_ACT_INVENTARIO"].dt.normalize(), False),
+    Regla("SIN SLA EN TABLA DE TIEMPOS",
+          lambda inv: pd.to_numeric(inv.get("DIAS_POR_ETAPA"), errors="coerce").isna(), False),
+    Regla("CAPITAL_ACT NO NUMERICO", lambda inv: _numerica_invalida(inv, "CAPITAL_ACT"), False),
+    Regla("OPERACION DUPLICADA", lambda inv: _duplicada(inv, "OPERACION"), False),
+    Regla("OPERACION DUPLICADA CON ETAPA/CAPITAL DISTINTOS", lambda inv: _bandera(inv, COL_DUP_CONFLICTO), False),
+    Regla("OPERACION CON VARIOS DEUDORES", lambda inv: _bandera(inv, COL_VARIOS_DEUDORES), False),
+]
+
+
+def evaluar_reglas(inv: pd.DataFrame, reglas: list = REGLAS_PASO4) -> tuple:
+    """
+    Evalúa todas las reglas en una pasada. Devuelve (codigos, excluidas): la máscara de bits
+    por fila (uint32) y la máscara booleana de filas que alguna regla excluyente descarta.
+    """
+    codigos = np.zeros(len(inv), dtype=np.uint32)
+    bits_excluyentes = 0
+    for bit, regla in enumerate(reglas):
+        hit = np.asarray(regla.mascara(inv), dtype=bool)
+        codigos |= hit.astype(np.uint32) << np.uint32(bit)
+        if regla.excluye:
+            bits_excluyentes |= 1 << bit
+    return codigos, (codigos & np.uint32(bits_excluyentes)) != 0
+
+
+def describir_codigos(codigos: pd.Series, reglas: list = REGLAS_PASO4) -> pd.Series:
+    """CODIGO_VALIDACION → "REGLA A | REGLA B"; decodifica una vez por código distinto."""
+    nombres = {
+        c: SEPARADOR.join(r.nombre for bit, r in enumerate(reglas) if c >> bit & 1)
+        for c in pd.unique(codigos)
+    }
+    return codigos.map(nombres).replace("", None)
+
+
+def conteo_reglas(codigos: pd.Series, reglas: list = REGLAS_PASO4) -> pd.DataFrame:
+    """Filas que incumple cada regla (una fila puede contar en varias)."""
+    valores = codigos.to_numpy(dtype=np.uint32)
+    return pd.DataFrame({
+        "REGLA": [r.nombre for r in reglas],
+        "EXCLUYE_DE_LA_BASE": ["SÍ" if r.excluye else "NO" for r in reglas],
+        "REGISTROS": [int(np.count_nonzero(valores >> np.uint32(bit) & 1)) for bit in range(len(reglas))],
+    })
+
+
+# ============================================
+# 📤 Reporte de errores en streaming (xlsxwriter constant_memory)
+# ============================================
+def escribir_errores_xlsx(errores: pd.DataFrame, destino, reglas: list = REGLAS_PASO4,
+                          bloque: int = 20_000) -> None:
+    """
+    Escribe el reporte fila a fila con constant_memory: xlsxwriter vuelca cada fila a disco
+    al pasar a la siguiente, así la memoria no crece con el número de errores.
+    `destino` puede ser ruta o BytesIO.
+    """
+    import xlsxwriter
+
+    libro = xlsxwriter.Workbook(destino, {"constant_memory": True, "nan_inf_to_errors": True,
+                                          "default_date_format": "yyyy-mm-dd hh:mm:ss"})
+    negrita = libro.add_format({"bold": True})
+
+    hoja = libro.add_worksheet("Errores_Paso4")
+    hoja.write_row(0, 0, [str(c) for c in errores.columns], negrita)
+    fila = 1
+    for inicio in range(0, len(errores), bloque):
+        parte = errores.iloc[inicio:inicio + bloque].astype(object)
+        valores = parte.where(parte.notna(), None).to_numpy()
+        for registro in valores:
+            hoja.write_row(fila, 0, [v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in registro])
+            fila += 1
+
+    resumen = libro.add_worksheet("Resumen_Reglas")
+    conteo = conteo_reglas(errores[COL_CODIGO], reglas)
+    hoja_filas = [list(conteo.columns)] + conteo.values.tolist()
+    for i, registro in enumerate(hoja_filas):
+        resumen.write_row(i, 0, registro, negrita if i == 0 else None)
+    libro.close()
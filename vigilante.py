@@ -0,0 +1,96 @@
+# ============================================
+# 👀 Vigilante de carpeta — precálculo de inventarios entrantes
+# Revisa una carpeta cada `intervalo` segundos; cada .xlsx nuevo o modificado se procesa
+# (Pasos 1–5, resúmenes y libros) y queda en la caché de precalculo.py por hash.
+#
+#   python vigilante.py --carpeta /ruta/compartida/inventarios --intervalo 60
+# ============================================
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from motor import COL_SUB_TIEMPOS, TIEMPOS_PATH, leer_excel_normalizado
+from precalculo import CACHE_DIR, clave_dataset, hash_contenido, leer_manifiesto, podar, precalcular
+from subetapas import construir_indice, firma_alias
+
+
+def _log(mensaje: str):
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {mensaje}", flush=True)
+
+
+def archivos_listos(carpeta: str, vistos: dict, pendientes: dict) -> list:
+    """
+    .xlsx nuevos o modificados cuyo tamaño y mtime no cambiaron desde la revisión anterior
+    (evita leer un archivo que todavía se está copiando). Ignora temporales de Excel (~$).
+    """
+    listos = []
+    for nombre in sorted(os.listdir(carpeta)):
+        if not nombre.lower().endswith(".xlsx") or nombre.startswith("~$"):
+            continue
+        ruta = os.path.join(carpeta, nombre)
+        try:
+            estado = (os.path.getsize(ruta), os.path.getmtime(ruta))
+        except OSError:
+            continue
+        if vistos.get(ruta) == estado:
+            continue
+        if pendientes.get(ruta) == estado:
+            listos.append(ruta)
+            vistos[ruta] = estado
+            del pendientes[ruta]
+        else:
+            pendientes[ruta] = estado
+    return listos
+
+
+def vigilar(carpeta: str, intervalo: float = 60, deduplicar: bool = False,
+            raiz: str = CACHE_DIR, conservar: int = 20, una_vez: bool = False):
+    tiempos = leer_excel_normalizado(TIEMPOS_PATH)
+    indice = construir_indice(tiempos[COL_SUB_TIEMPOS])
+    vistos, pendientes = {}, {}
+    _log(f"👀 Vigilando {carpeta} (caché: {raiz})")
+
+    while True:
+        listos = archivos_listos(carpeta, vistos, pendientes)
+        # Primera pasada o --una-vez: no esperar otra revisión para confirmar que el archivo está quieto
+        if una_vez and pendientes:
+            listos += archivos_listos(carpeta, vistos, pendientes)
+
+        for ruta in listos:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+            clave = clave_dataset(hash_contenido(contenido), deduplicar)
+            manifiesto = leer_manifiesto(clave, raiz)
+            if manifiesto and manifiesto.get("firma_alias") == firma_alias():
+                _log(f"✔️ {os.path.basename(ruta)} ya está precalculado ({clave[:12]})")
+                continue
+            inicio = time.perf_counter()
+            try:
+                precalcular(contenido, tiempos, indice, deduplicar, raiz)
+            except Exception as e:  # un archivo dañado no detiene al vigilante
+                _log(f"❌ {os.path.basename(ruta)}: {e}")
+                continue
+            _log(f"✅ {os.path.basename(ruta)} → {clave[:12]} en {time.perf_counter() - inicio:.1f} s")
+            for borrada in podar(conservar, raiz):
+                _log(f"🧹 Caché eliminada: {os.path.basename(borrada)}")
+
+        if una_vez:
+            return
+        time.sleep(intervalo)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalcula inventarios que llegan a una carpeta")
+    parser.add_argument("--carpeta", required=True)
+    parser.add_argument("--intervalo", type=float, default=60, help="segundos entre revisiones")
+    parser.add_argument("--cache", default=CACHE_DIR)
+    parser.add_argument("--conservar", type=int, default=20, help="entradas de caché a conservar")
+    parser.add_argument("--deduplicar", action="store_true", help="una fila por OPERACION")
+    parser.add_argument("--una-vez", action="store_true", help="procesa lo que haya y termina")
+    args = parser.parse_args()
+    try:
+        vigilar(args.carpeta, args.intervalo, args.deduplicar, args.cache, args.conservar, args.una_vez)
+    except KeyboardInterrupt:
+        pass